@@ -2,6 +2,7 @@
 Demo script to test ladder loading with retry logic and error handling.
 Simulates API failures and recovery scenarios.
 """
+import asyncio
 import sys
 import time
 from unittest.mock import Mock, patch
@@ -59,7 +60,7 @@ def demo_scenario_1_api_failure_then_success():
     state.cnc_api_client.fetch_ladders.side_effect = mock_fetch
 
     # Load ladders with max 5 retries, 1 second delay
-    success = state.load_ladders(max_retries=5, retry_delay=1)
+    success = asyncio.run(state.load_ladders(max_retries=5, retry_delay=1))
 
     print(f"\nResult: {'SUCCESS' if success else 'FAILED'}")
     print(f"Ladders loaded: {state.ladders}")
@@ -83,7 +84,7 @@ def demo_scenario_2_all_retries_fail():
     )
 
     # Try with only 3 retries to keep test fast
-    success = state.load_ladders(max_retries=3, retry_delay=1)
+    success = asyncio.run(state.load_ladders(max_retries=3, retry_delay=1))
 
     print(f"\nResult: {'SUCCESS' if success else 'FAILED'}")
     print(f"Ladders loaded: {state.ladders}")
@@ -109,7 +110,7 @@ def demo_scenario_3_immediate_success():
         {"abbreviation": "ra", "private": 0}
     ]
 
-    success = state.load_ladders(max_retries=5, retry_delay=1)
+    success = asyncio.run(state.load_ladders(max_retries=5, retry_delay=1))
 
     print(f"\nResult: {'SUCCESS' if success else 'FAILED'}")
     print(f"Ladders loaded: {state.ladders}")
@@ -130,7 +131,7 @@ def demo_scenario_4_empty_ladder_list():
     # Empty list
     state.cnc_api_client.fetch_ladders.return_value = []
 
-    success = state.load_ladders(max_retries=5, retry_delay=1)
+    success = asyncio.run(state.load_ladders(max_retries=5, retry_delay=1))
 
     print(f"\nResult: {'SUCCESS' if success else 'FAILED'}")
     print(f"Ladders loaded: {state.ladders}")
@@ -154,7 +155,7 @@ def demo_scenario_5_malformed_data():
         {"abbreviation": "ra2", "private": 0}
     ]
 
-    success = state.load_ladders(max_retries=5, retry_delay=1)
+    success = asyncio.run(state.load_ladders(max_retries=5, retry_delay=1))
 
     print(f"\nResult: {'SUCCESS' if success else 'FAILED'}")
     print(f"Ladders loaded: {state.ladders}")
@@ -52,6 +52,7 @@ class CnCNetBot:
 
         # Register event handlers
         self._register_events()
+        self._register_shutdown_hook()
 
         # Register all commands (prefix and slash)
         self.command_manager.register_all_commands()
@@ -65,6 +66,9 @@ class CnCNetBot:
         async def on_ready():
             """Called when the bot successfully connects to Discord"""
             await self.lifecycle.on_ready()
+
+            # Background tasks need a ladder list, start them as soon as one is available
+            await self.lifecycle.wait_for_ladders()
             self.task_manager.start_all_tasks()
 
         @self.bot.event
@@ -73,6 +77,17 @@ class CnCNetBot:
             logger.warning(f"WARNING - We are being rate limited: {rate_limit_info}")
             await send_message_to_log_channel(bot=self.bot, msg=str(rate_limit_info))
 
+    def _register_shutdown_hook(self) -> None:
+        """Close the API client's pooled connections before the Discord client shuts down"""
+        discord_close = self.bot.close
+
+        async def close() -> None:
+            self.lifecycle.cancel_startup_jobs()
+            await self.state.close()
+            await discord_close()
+
+        self.bot.close = close
+
     def run(self) -> None:
         """Start the bot"""
         logger.log(f"Starting CnCNet Ladder Bot (DEBUG={self.config.debug})")
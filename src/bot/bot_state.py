@@ -1,7 +1,11 @@
 """Bot state management"""
-from typing import Optional, List
+from typing import Optional, List, Dict
 import asyncio
+import time
+from src.constants.constants import CANDLE_HISTORY_PATH, LADDER_CACHE_PATH, LIVE_SNAPSHOT_PATH
+from src.svc.candle_history import CandleHistoryStore
 from src.svc.cncnet_api_svc import CnCNetApiSvc
+from src.svc.snapshot_store import SnapshotStore
 from src.util.logger import MyLogger
 from src.util.utils import is_error, get_exception_msg
 
@@ -13,15 +17,65 @@ class BotState:
 
     def __init__(self):
         self.cnc_api_client: Optional[CnCNetApiSvc] = None
+        self.candle_history = CandleHistoryStore(CANDLE_HISTORY_PATH)
         self.ladders: List[str] = []
+        self.ladders_available = asyncio.Event()  # Set once a ladder list has been loaded
         self._ladder_load_failed_count: int = 0
 
-    def initialize_api_client(self) -> None:
-        """Initialize the CnCNet API client"""
-        self.cnc_api_client = CnCNetApiSvc()
+    def initialize_api_client(self, cache_ttls: Optional[Dict[str, float]] = None) -> None:
+        """
+        Initialize the CnCNet API client, backed by the on-disk ladder, map pool and live data caches.
+
+        Args:
+            cache_ttls: Optional per-endpoint response cache TTLs in seconds
+        """
+        snapshot_store = SnapshotStore(LADDER_CACHE_PATH)
+        snapshot_store.load()
+        live_snapshot_store = SnapshotStore(LIVE_SNAPSHOT_PATH)
+        live_snapshot_store.load()
+        self.cnc_api_client = CnCNetApiSvc(
+            cache_ttls=cache_ttls,
+            snapshot_store=snapshot_store,
+            live_snapshot_store=live_snapshot_store
+        )
         logger.log("API client initialized")
 
-    def load_ladders(self, max_retries: int = 5, retry_delay: int = 10) -> bool:
+    def load_cached_ladders(self) -> bool:
+        """
+        Populate the ladder list from the on-disk cache so the bot can start before the API answers.
+
+        Returns:
+            bool: True if a cached ladder list was loaded, False otherwise
+        """
+        if not self.cnc_api_client:
+            raise RuntimeError("API client not initialized")
+
+        cached = self.cnc_api_client.cached_snapshot("ladders")
+        if cached is None:
+            return False
+
+        ladders_json, fetched_at = cached
+        try:
+            new_ladders = [item["abbreviation"] for item in ladders_json if item.get("private") == 0]
+        except (KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Error parsing cached ladder data: {e}")
+            return False
+
+        if not new_ladders:
+            return False
+
+        self.ladders = new_ladders
+        self.ladders_available.set()
+        age_minutes = int((time.time() - fetched_at) // 60)
+        logger.log(f"Loaded {len(self.ladders)} cached ladders ({age_minutes} min old): {', '.join(self.ladders)}")
+        return True
+
+    async def close(self) -> None:
+        """Release the API client's pooled connections"""
+        if self.cnc_api_client:
+            await self.cnc_api_client.close()
+
+    async def load_ladders(self, max_retries: int = 5, retry_delay: int = 10) -> bool:
         """
         Fetch and store available ladders from CnCNet API with retry logic.
 
@@ -39,7 +93,7 @@ class BotState:
             raise RuntimeError("API client not initialized")
 
         for attempt in range(max_retries):
-            ladders_json = self.cnc_api_client.fetch_ladders()
+            ladders_json = await self.cnc_api_client.fetch_ladders()
 
             # Check if the API returned an error
             if is_error(ladders_json):
@@ -50,8 +104,7 @@ class BotState:
                     # Exponential backoff: 10s, 20s, 40s, 80s
                     wait_time = retry_delay * (2 ** attempt)
                     logger.log(f"Retrying in {wait_time} seconds...")
-                    import time
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                 else:
                     logger.error(f"Failed to load ladders after {max_retries} attempts. Bot will retry via background task.")
@@ -67,6 +120,7 @@ class BotState:
                 # Only update if we got a valid list
                 if new_ladders:
                     self.ladders = new_ladders
+                    self.ladders_available.set()
                     self._ladder_load_failed_count = 0
                     logger.log(f"Loaded {len(self.ladders)} ladders: {', '.join(self.ladders)}")
                     return True
@@ -89,9 +143,7 @@ class BotState:
         """
         logger.log("Refreshing ladder list...")
 
-        # Run the synchronous load_ladders in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, lambda: self.load_ladders(max_retries=3, retry_delay=5))
+        result = await self.load_ladders(max_retries=3, retry_delay=5)
 
         if result:
             logger.log("Ladder list refreshed successfully")
@@ -1,5 +1,5 @@
 """Discord command registration and management"""
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 from discord.ext import commands
 from discord import app_commands, Interaction
 
@@ -8,7 +8,7 @@ if TYPE_CHECKING:
 
 from src.commands.get_maps import get_maps
 from src.commands.create_qm_roles import create_qm_roles as create_qm_roles_impl
-from src.commands.candle import candle as candle_impl
+from src.commands.candle import candle as candle_impl, handle_candle_interaction
 from src.bot.slash_context import SlashContext
 from src.util.logger import MyLogger
 
@@ -33,6 +33,7 @@ class CommandManager:
         """Register both prefix and slash commands"""
         self._register_prefix_commands()
         self._register_slash_commands()
+        self._register_component_handlers()
         logger.log("All commands registered")
 
     def _register_prefix_commands(self) -> None:
@@ -55,12 +56,12 @@ class CommandManager:
             )
 
         @self.bot.command(name="candle")
-        async def candle(ctx: commands.Context, player: str, ladder: str) -> None:
+        async def candle(ctx: commands.Context, player: str, ladder: str, days: int = None) -> None:
             """
-            Display player's daily win/loss candle chart.
+            Display player's daily win/loss candle chart, or one candle per day for the last N days.
 
-            Usage: !candle <player> <ladder>
-            Example: !candle ProPlayer yr
+            Usage: !candle <player> <ladder> [days]
+            Example: !candle ProPlayer yr 7
             """
             await candle_impl(
                 ctx=ctx,
@@ -68,7 +69,9 @@ class CommandManager:
                 player=player,
                 ladder=ladder,
                 ladders=self.state.ladders,
-                cnc_api_client=self.state.cnc_api_client
+                cnc_api_client=self.state.cnc_api_client,
+                candle_history=self.state.candle_history,
+                days=days
             )
 
         @self.bot.command(name="purge_bot_channel_command")
@@ -89,7 +92,7 @@ class CommandManager:
             """
             Create QM ranking roles for a ladder (Admin only).
 
-            Usage: !create_qm_roles <ladder>
+            Usage: !create_qm_roles <ladder|all>
             Example: !create_qm_roles yr
             """
             await create_qm_roles_impl(ctx=ctx, bot=self.bot, ladder=ladder)
@@ -114,13 +117,15 @@ class CommandManager:
         @self.bot.tree.command(name="candle", description="Display player's daily win/loss candle chart")
         @app_commands.describe(
             ladder="Which ladder to check",
-            player="Player name to lookup"
+            player="Player name to lookup",
+            days="Show one candle per day for the last N days instead (e.g. 7 or 30)"
         )
         @app_commands.autocomplete(ladder=self._ladder_autocomplete)
         async def candle_slash(
             interaction: Interaction,
             ladder: str,
-            player: str
+            player: str,
+            days: Optional[app_commands.Range[int, 2, 30]] = None
         ) -> None:
             """Slash command version of !candle with ladder dropdown first"""
             ctx = SlashContext(interaction)
@@ -130,12 +135,14 @@ class CommandManager:
                 player=player,
                 ladder=ladder,
                 ladders=self.state.ladders,
-                cnc_api_client=self.state.cnc_api_client
+                cnc_api_client=self.state.cnc_api_client,
+                candle_history=self.state.candle_history,
+                days=days
             )
 
         @self.bot.tree.command(name="create_qm_roles", description="Create QM ranking roles for a ladder (Admin only)")
-        @app_commands.describe(ladder="Which ladder to create roles for")
-        @app_commands.autocomplete(ladder=self._ladder_autocomplete)
+        @app_commands.describe(ladder="Which ladder to create roles for, or 'all' for every configured ladder")
+        @app_commands.autocomplete(ladder=self._create_roles_ladder_autocomplete)
         @app_commands.default_permissions(administrator=True)
         async def create_qm_roles_slash(interaction: Interaction, ladder: str) -> None:
             """Slash command version of !create_qm_roles with admin permission check"""
@@ -150,6 +157,14 @@ class CommandManager:
             await self._purge_bot_channel(0)
             await interaction.followup.send("✅ Bot channel purged successfully!", ephemeral=True)
 
+    def _register_component_handlers(self) -> None:
+        """Register handlers for message components (buttons) that must keep working after a restart"""
+
+        async def on_interaction(interaction: Interaction) -> None:
+            await handle_candle_interaction(interaction, self.state.cnc_api_client, self.state.candle_history)
+
+        self.bot.add_listener(on_interaction, "on_interaction")
+
     async def _ladder_autocomplete(
         self,
         interaction: Interaction,
@@ -171,6 +186,26 @@ class CommandManager:
             if current.lower() in ladder.lower()
         ][:25]  # Discord limits to 25 choices
 
+    async def _create_roles_ladder_autocomplete(
+        self,
+        interaction: Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """
+        Ladder suggestions for /create_qm_roles, led by "all" for every configured ladder.
+
+        Args:
+            interaction: The Discord interaction
+            current: Current text typed by user
+
+        Returns:
+            List of matching choices (max 25)
+        """
+        choices = await self._ladder_autocomplete(interaction, current)
+        if current.lower() in "all":
+            choices.insert(0, app_commands.Choice(name="ALL", value="all"))
+        return choices[:25]  # Discord limits to 25 choices
+
     async def _purge_bot_channel(self, keep_messages_count: int) -> None:
         """
         Purge messages from QM bot channels across all servers.
@@ -22,6 +22,20 @@ class BotConfig:
     cleanup_duplicate_messages_interval_minutes: int = 10
     refresh_ladders_interval_hours: int = 4
 
+    # Multi-day candle history: every lookup records the player's day, and players looked up
+    # within candle_history_tracked_days get one sweep just before the UTC day rolls over
+    candle_history_sweep_minutes_before_midnight: int = 3
+    candle_history_tracked_days: int = 30
+    candle_history_max_players: int = 50
+
+    # API response cache TTLs (in seconds), shared by all tasks polling the same endpoint
+    stats_cache_ttl_seconds: int = 15
+    active_matches_cache_ttl_seconds: int = 15
+    player_stats_cache_ttl_seconds: int = 60  # Candle lookups
+
+    # How long the bot channel keeps showing the last good stats while the ladder API is failing
+    live_snapshot_max_stale_minutes: int = 30
+
     # Authorized servers
     authorized_servers: Set[int] = None
 
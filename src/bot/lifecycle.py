@@ -1,5 +1,6 @@
 """Bot lifecycle and initialization management"""
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Optional
 from discord.ext import commands
 import discord
 
@@ -7,6 +8,7 @@ if TYPE_CHECKING:
     from src.bot.bot_state import BotState
     from src.bot.config import BotConfig
 
+from src.commands.get_active_matches import last_summary_message_ids
 from src.util.utils import send_message_to_log_channel
 from src.util.logger import MyLogger
 from src.constants.constants import QM_BOT_CHANNEL_NAME
@@ -29,22 +31,61 @@ class BotLifecycle:
         self.bot = bot
         self.state = state
         self.config = config
+        self._ladder_load_task: Optional[asyncio.Task] = None
 
     async def on_ready(self) -> None:
         """
         Handle bot ready event.
         Called when the bot has successfully connected to Discord.
+
+        Ladder loading runs as a background job so its retry backoff never
+        holds up the rest of startup; use wait_for_ladders() to wait for it.
         """
         logger.log(f"Bot online with DEBUG={self.config.debug}")
+
+        # on_ready fires again after reconnects, keep the existing client and its pooled connections
+        if not self.state.cnc_api_client:
+            self.state.initialize_api_client(cache_ttls={
+                "stats": self.config.stats_cache_ttl_seconds,
+                "active_matches": self.config.active_matches_cache_ttl_seconds,
+                "player_stats": self.config.player_stats_cache_ttl_seconds,
+            })
+            # Serve the cached ladder list right away, the background job refreshes it from the API
+            self.state.load_cached_ladders()
+        self.start_ladder_loading()
+
         await send_message_to_log_channel(self.bot, "Ladder bot is online...")
 
         await self.check_authorized_servers()
+
+        # Load the persisted summary messages before the first tick so existing messages are edited in place
+        last_summary_message_ids.load()
         await self.purge_bot_channels()
-        self.state.initialize_api_client()
 
-        # Try to load ladders with retry logic
-        success = self.state.load_ladders()
-        if not success:
+        await self.sync_slash_commands()
+
+    def start_ladder_loading(self) -> None:
+        """Start the background ladder loading job unless a load is running or already succeeded"""
+        task = self._ladder_load_task
+        if task and not task.done():
+            return
+        if task and not task.cancelled():
+            # A job that raised counts as not loaded; reading its exception also marks it retrieved
+            error = task.exception()
+            if error is not None:
+                logger.error(f"Previous ladder load failed: {type(error).__name__}: {error}")
+            elif task.result():
+                return
+        self._ladder_load_task = asyncio.create_task(self._load_ladders_job())
+
+    async def _load_ladders_job(self) -> bool:
+        """Load ladders with retry logic, alerting the log channel if every attempt fails"""
+        success = await self.state.load_ladders()
+        if success:
+            return True
+        if self.state.ladders:
+            logger.error("Failed to refresh ladder list from the API, continuing with the cached list")
+        else:
             error_msg = (
                 "**WARNING:** Failed to load ladder list during initialization. "
                 "Bot will continue running and retry via background task every 4 hours. "
@@ -52,8 +93,23 @@ class BotLifecycle:
             )
             logger.error(error_msg)
             await send_message_to_log_channel(self.bot, error_msg)
+        return False
 
-        await self.sync_slash_commands()
+    async def wait_for_ladders(self) -> None:
+        """Wait until a ladder list is available or the startup ladder load has given up"""
+        if self.state.ladders_available.is_set() or not self._ladder_load_task:
+            return
+
+        ladders_available = asyncio.ensure_future(self.state.ladders_available.wait())
+        try:
+            await asyncio.wait({ladders_available, self._ladder_load_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ladders_available.cancel()
+
+    def cancel_startup_jobs(self) -> None:
+        """Cancel the ladder loading job if it's still retrying"""
+        if self._ladder_load_task and not self._ladder_load_task.done():
+            self._ladder_load_task.cancel()
 
     async def check_authorized_servers(self) -> None:
         """
@@ -91,11 +147,18 @@ class BotLifecycle:
         Purge messages from all bot channels across all servers.
 
         This cleans up old messages when the bot starts to ensure
-        a fresh state.
+        a fresh state. Channels with a persisted summary message are
+        left alone so the bot resumes editing that message.
         """
         for server in self.bot.guilds:
             for channel in server.channels:
                 if QM_BOT_CHANNEL_NAME in channel.name:
+                    if channel.id in last_summary_message_ids:
+                        logger.debug(
+                            f"Skipping purge of '{server.name}.{channel.name}', "
+                            f"resuming message {last_summary_message_ids[channel.id]}"
+                        )
+                        continue
                     try:
                         message_count = 0
                         async for _ in channel.history(limit=2):
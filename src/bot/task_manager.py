@@ -1,4 +1,5 @@
 """Background task management"""
+import datetime
 from typing import TYPE_CHECKING
 from discord.ext import tasks, commands
 
@@ -6,7 +7,7 @@ if TYPE_CHECKING:
     from src.bot.bot_state import BotState
     from src.bot.config import BotConfig
 
-from src.tasks import update_channel_bot_task, sync_qm_ranking_roles_task
+from src.tasks import update_channel_bot_task, sync_qm_ranking_roles_task, record_candle_history_task
 from src.tasks.update_qm_bot_channel_name_task import update_qm_bot_channel_name_task
 from src.tasks.cleanup_duplicate_messages_task import execute as cleanup_duplicate_messages
 from src.util.logger import MyLogger
@@ -45,7 +46,8 @@ class TaskManager:
                 ladders=self.state.ladders,
                 cnc_api_client=self.state.cnc_api_client,
                 debug=self.config.debug,
-                bot_state=self.state
+                bot_state=self.state,
+                max_stale_seconds=self.config.live_snapshot_max_stale_minutes * 60
             )
 
             if response.get("error"):
@@ -71,9 +73,12 @@ class TaskManager:
                 update_channel_name._has_run = True
                 return
 
-            stats_json = self.state.cnc_api_client.fetch_stats("all")
-            active_matches = self.state.cnc_api_client.active_matches(ladder="all")
-            await update_qm_bot_channel_name_task(self.bot, stats_json, active_matches)
+            snapshot = await self.state.cnc_api_client.fetch_live_snapshot("all")
+            await update_qm_bot_channel_name_task(self.bot, snapshot.stats_json, snapshot.active_matches_json)
+            logger.debug(f"API cache stats: {self.state.cnc_api_client.cache_stats()}")
+            open_circuits = self.state.cnc_api_client.circuit_states()
+            if open_circuits:
+                logger.warning(f"API circuits not closed: {open_circuits}")
 
         @tasks.loop(hours=self.config.sync_roles_interval_hours)
         async def sync_roles() -> None:
@@ -113,26 +118,50 @@ class TaskManager:
             if not success:
                 logger.error("Periodic ladder refresh failed, will retry next interval")
 
+        sweep_minute_of_day = 24 * 60 - self.config.candle_history_sweep_minutes_before_midnight
+        sweep_at = datetime.time(sweep_minute_of_day // 60, sweep_minute_of_day % 60, tzinfo=datetime.timezone.utc)
+
+        @tasks.loop(time=sweep_at)
+        async def record_candle_history() -> None:
+            """
+            Record the day's final stats for recently looked-up players, for multi-day candles.
+            Runs once a day, just before 00:00 UTC when the daily stats reset.
+            """
+            await record_candle_history_task.execute(
+                cnc_api_client=self.state.cnc_api_client,
+                candle_history=self.state.candle_history,
+                tracked_days=self.config.candle_history_tracked_days,
+                max_players=self.config.candle_history_max_players
+            )
+
         # Store task references
         self.update_bot_channel_task = update_bot_channel
         self.update_channel_name_task = update_channel_name
         self.sync_roles_task = sync_roles
         self.cleanup_duplicates_task = cleanup_duplicates
         self.refresh_ladders_task = refresh_ladders
+        self.record_candle_history_task = record_candle_history
 
     def start_all_tasks(self) -> None:
         """
         Start all background tasks.
 
+        Safe to call again after a reconnect, tasks that are already running are left alone.
         Note: sync_roles_task is only started if DEBUG is False.
         """
-        self.update_bot_channel_task.start()
-        self.update_channel_name_task.start()
-        self.cleanup_duplicates_task.start()
-        self.refresh_ladders_task.start()
-
+        tasks_to_start = [
+            self.update_bot_channel_task,
+            self.update_channel_name_task,
+            self.cleanup_duplicates_task,
+            self.refresh_ladders_task,
+            self.record_candle_history_task
+        ]
         if not self.config.debug:
-            self.sync_roles_task.start()
+            tasks_to_start.append(self.sync_roles_task)
+
+        for task in tasks_to_start:
+            if not task.is_running():
+                task.start()
 
         logger.log("All background tasks started")
 
@@ -153,4 +182,7 @@ class TaskManager:
         if self.sync_roles_task.is_running():
             self.sync_roles_task.cancel()
 
+        if self.record_candle_history_task.is_running():
+            self.record_candle_history_task.cancel()
+
         logger.log("All background tasks stopped")
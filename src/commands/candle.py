@@ -1,13 +1,60 @@
-from datetime import datetime, timezone
-import time
+from datetime import datetime, timedelta, timezone
 import discord
 from discord.ui import View, Button
+from src.util.cooldown import CooldownTracker
 from src.util.logger import MyLogger
 from src.constants.constants import BUTTON_COOLDOWN_SECONDS
+from src.util.utils import is_api_unavailable, api_unavailable_msg
 
 logger = MyLogger("Candle")
 
 
+MAX_CANDLE_HEIGHT = 15
+MAX_HISTORY_CANDLE_HEIGHT = 10  # Rows of the multi-day chart
+MAX_HISTORY_DAYS = 30
+HISTORY_EMPTY_BLOCK = "⬛"
+
+
+def scale_candle_blocks(wins: int, losses: int, max_height: int, total_for_scale: int = None) -> tuple[int, int]:
+    """
+    Scale wins and losses to candle blocks no taller than max_height.
+
+    Args:
+        wins: Number of wins
+        losses: Number of losses
+        max_height: Maximum number of blocks
+        total_for_scale: Game count that maps to max_height (defaults to this candle's own total),
+            pass the busiest day's total to keep several candles on the same scale
+
+    Returns:
+        Tuple of (red_blocks, green_blocks)
+    """
+    total_games = wins + losses
+    total_for_scale = total_for_scale or total_games
+    if total_for_scale <= max_height:
+        return losses, wins
+
+    # Scale down proportionally
+    scale_factor = max_height / total_for_scale
+    red_blocks = round(losses * scale_factor)
+    green_blocks = round(wins * scale_factor)
+
+    # Ensure at least 1 block if there are wins/losses
+    if losses > 0 and red_blocks == 0:
+        red_blocks = 1
+    if wins > 0 and green_blocks == 0:
+        green_blocks = 1
+
+    # Adjust if total exceeds max (due to rounding)
+    if red_blocks + green_blocks > max_height:
+        if red_blocks > green_blocks:
+            red_blocks -= 1
+        else:
+            green_blocks -= 1
+
+    return red_blocks, green_blocks
+
+
 def build_candle_message(player: str, ladder: str, wins: int, losses: int, points: int, period: str = "daily"):
     """
     Build the candle visualization message.
@@ -53,32 +100,7 @@ def build_candle_message(player: str, ladder: str, wins: int, losses: int, point
         message += f"🕯️ No games played {no_games_msg}"
     else:
         # Maximum candle height (excluding flame and stats)
-        max_candle_height = 15
-
-        # Calculate scaled blocks if needed
-        if total_games > max_candle_height:
-            # Scale down proportionally
-            scale_factor = max_candle_height / total_games
-            red_blocks = round(losses * scale_factor)
-            green_blocks = round(wins * scale_factor)
-
-            # Ensure at least 1 block if there are wins/losses
-            if losses > 0 and red_blocks == 0:
-                red_blocks = 1
-            if wins > 0 and green_blocks == 0:
-                green_blocks = 1
-
-            # Adjust if total exceeds max (due to rounding)
-            total_blocks = red_blocks + green_blocks
-            if total_blocks > max_candle_height:
-                if red_blocks > green_blocks:
-                    red_blocks -= 1
-                else:
-                    green_blocks -= 1
-
-        else:
-            red_blocks = losses
-            green_blocks = wins
+        red_blocks, green_blocks = scale_candle_blocks(wins, losses, MAX_CANDLE_HEIGHT)
 
         # Add flame at top if there are games
         message += "🔥\n"
@@ -99,141 +121,170 @@ def build_candle_message(player: str, ladder: str, wins: int, losses: int, point
     return message
 
 
-class CandleView(View):
-    """Interactive view with Daily/Monthly buttons for candle command."""
-
-    def __init__(self, player: str, ladder: str, cnc_api_client, initial_period: str = "daily", cooldown_seconds: int = BUTTON_COOLDOWN_SECONDS):
-        super().__init__(timeout=300)  # 5 minute timeout
-        self.player = player
-        self.ladder = ladder
-        self.cnc_api_client = cnc_api_client
-        self.current_period = initial_period
-        self.cooldown_seconds = cooldown_seconds
-        self.last_interaction_time = {}  # (user_id, button_id) -> timestamp
-
-        # Update button styles based on current period
-        self.update_button_styles()
-
-    def is_on_cooldown(self, user_id: int, button_id: str) -> tuple[bool, float]:
-        """
-        Check if user is on cooldown for a specific button.
-
-        Args:
-            user_id: Discord user ID
-            button_id: Button custom_id ("daily" or "monthly")
-
-        Returns:
-            Tuple of (is_on_cooldown: bool, remaining_seconds: float)
-        """
-        key = (user_id, button_id)
-        if key not in self.last_interaction_time:
-            return False, 0.0
-
-        elapsed = time.time() - self.last_interaction_time[key]
-        remaining = self.cooldown_seconds - elapsed
-
-        if remaining > 0:
-            return True, remaining
-        return False, 0.0
-
-    def update_button_styles(self):
-        """Update button styles to show which period is active."""
-        for child in self.children:
-            if isinstance(child, Button):
-                if child.custom_id == "daily":
-                    child.style = discord.ButtonStyle.primary if self.current_period == "daily" else discord.ButtonStyle.secondary
-                elif child.custom_id == "monthly":
-                    child.style = discord.ButtonStyle.primary if self.current_period == "monthly" else discord.ButtonStyle.secondary
-
-    @discord.ui.button(label="Daily", style=discord.ButtonStyle.primary, custom_id="daily")
-    async def daily_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Handle Daily button click."""
-        # Check cooldown for this specific button
-        on_cooldown, remaining = self.is_on_cooldown(interaction.user.id, "daily")
-        if on_cooldown:
-            await interaction.response.send_message(
-                f"Please wait {remaining:.0f} seconds before clicking Daily again.",
-                ephemeral=True
-            )
-            return
-
-        # Update last interaction time for this button
-        self.last_interaction_time[(interaction.user.id, "daily")] = time.time()
-
-        await interaction.response.defer()
-
-        # Fetch daily stats
-        stats = self.cnc_api_client.fetch_player_daily_stats(self.ladder, self.player)
-
-        if isinstance(stats, Exception):
-            logger.error(f"Exception fetching daily stats for {self.player} on {self.ladder}: {type(stats).__name__}, {str(stats)}")
-            await interaction.followup.send(f"Error: Could not fetch daily stats for {self.player}", ephemeral=True)
-            return
-
-        if "error" in stats:
-            logger.error(f"API error fetching daily stats for {self.player} on {self.ladder}: {stats.get('error')}")
-            await interaction.followup.send(f"Error: Could not fetch daily stats for {self.player}", ephemeral=True)
-            return
-
-        wins = stats.get('wins', 0)
-        losses = stats.get('losses', 0)
-        points = stats.get('points', 0)
-
-        # Update current period and button styles
-        self.current_period = "daily"
-        self.update_button_styles()
-
-        # Build and send updated message
-        message = build_candle_message(self.player, self.ladder, wins, losses, points, "daily")
-        await interaction.edit_original_response(content=message, view=self)
-
-    @discord.ui.button(label="Monthly", style=discord.ButtonStyle.secondary, custom_id="monthly")
-    async def monthly_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Handle Monthly button click."""
-        # Check cooldown for this specific button
-        on_cooldown, remaining = self.is_on_cooldown(interaction.user.id, "monthly")
-        if on_cooldown:
-            await interaction.response.send_message(
-                f"Please wait {remaining:.0f} seconds before clicking Monthly again.",
-                ephemeral=True
+def build_candle_history_message(player: str, ladder: str, history: list, days: int) -> str:
+    """
+    Build a multi-day chart with one candle per UTC day, oldest on the left.
+
+    Args:
+        player: Player name
+        ladder: Ladder name
+        history: Recorded (YYYY-MM-DD, wins, losses, points) rows, oldest first
+        days: Number of days shown, days without a recording are drawn empty
+
+    Returns:
+        Formatted candle message string
+    """
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=days - 1)
+    by_day = {day: (wins, losses, points) for day, wins, losses, points in history}
+    series = [by_day.get((first_day + timedelta(days=offset)).isoformat()) for offset in range(days)]
+
+    message = f"**{player}** on **{ladder.upper()}** - Last {days} Days ({first_day.isoformat()} to {today.isoformat()} UTC)\n\n"
+
+    recorded = [day for day in series if day is not None]
+    wins = sum(day[0] for day in recorded)
+    losses = sum(day[1] for day in recorded)
+    points = sum(day[2] for day in recorded)
+    if wins + losses == 0:
+        message += f"🕯️ No games recorded in the last {days} days"
+    else:
+        # Every candle shares the busiest day's scale so heights are comparable
+        busiest_day = max(day[0] + day[1] for day in recorded)
+        columns = []
+        for day in series:
+            red_blocks, green_blocks = scale_candle_blocks(day[0], day[1], MAX_HISTORY_CANDLE_HEIGHT, busiest_day) \
+                if day else (0, 0)
+            height = min(busiest_day, MAX_HISTORY_CANDLE_HEIGHT)
+            # Bottom-aligned: empty space, then losses, then wins
+            columns.append(
+                [HISTORY_EMPTY_BLOCK] * (height - red_blocks - green_blocks) + ["🟥"] * red_blocks + ["🟩"] * green_blocks
             )
-            return
 
-        # Update last interaction time for this button
-        self.last_interaction_time[(interaction.user.id, "monthly")] = time.time()
+        rows = ["".join(column[row] for column in columns) for row in range(len(columns[0]))]
+        message += "\n".join(rows) + "\n"
 
-        await interaction.response.defer()
+        win_rate = wins / (wins + losses) * 100
+        points_display = f"+{points}" if points >= 0 else str(points)
+        message += f"\n📊 **{wins}W - {losses}L** ({win_rate:.1f}% WR) | {points_display} points"
+
+    if len(recorded) < days:
+        message += f"\n*History is recorded from lookups, {len(recorded)} of {days} days have data*"
+    return message
 
-        # Fetch monthly stats
-        stats = self.cnc_api_client.fetch_player_monthly_stats(self.ladder, self.player)
 
-        if isinstance(stats, Exception):
-            logger.error(f"Exception fetching monthly stats for {self.player} on {self.ladder}: {type(stats).__name__}, {str(stats)}")
-            await interaction.followup.send(f"Error: Could not fetch monthly stats for {self.player}", ephemeral=True)
-            return
+CANDLE_CUSTOM_ID_PREFIX = "candle"
+CANDLE_PERIODS = ("daily", "monthly")
+MAX_CUSTOM_ID_LENGTH = 100  # Discord limit
 
-        if "error" in stats:
-            logger.error(f"API error fetching monthly stats for {self.player} on {self.ladder}: {stats.get('error')}")
-            await interaction.followup.send(f"Error: Could not fetch monthly stats for {self.player}", ephemeral=True)
-            return
+# One cooldown tracker for every candle message, keyed by (user_id, custom_id)
+button_cooldowns = CooldownTracker(BUTTON_COOLDOWN_SECONDS)
 
-        wins = stats.get('wins', 0)
-        losses = stats.get('losses', 0)
-        points = stats.get('points', 0)
 
-        # Update current period and button styles
-        self.current_period = "monthly"
-        self.update_button_styles()
+def candle_custom_id(period: str, ladder: str, player: str) -> str:
+    """Encode everything a button click needs into its custom_id, e.g. "candle:daily:yr:ProPlayer"."""
+    return f"{CANDLE_CUSTOM_ID_PREFIX}:{period}:{ladder}:{player}"
 
-        # Build and send updated message
-        message = build_candle_message(self.player, self.ladder, wins, losses, points, "monthly")
-        await interaction.edit_original_response(content=message, view=self)
 
+def parse_candle_custom_id(custom_id: str):
+    """
+    Decode a candle button custom_id.
+
+    Returns:
+        Tuple of (period, ladder, player), or None if custom_id isn't a candle button
+    """
+    parts = custom_id.split(":", 3)  # Player names may contain ':'
+    if len(parts) != 4 or parts[0] != CANDLE_CUSTOM_ID_PREFIX or parts[1] not in CANDLE_PERIODS:
+        return None
+    _, period, ladder, player = parts
+    return period, ladder, player
 
-async def candle(ctx, bot, player, ladder, ladders, cnc_api_client):
-    """Check a player's daily wins and losses for a specific ladder with interactive period selection."""
+
+class CandleView(View):
+    """
+    Daily/Monthly buttons for a candle message.
+
+    The view holds no state: player, ladder and period live in each button's custom_id
+    and clicks are handled by handle_candle_interaction(), registered once at startup.
+    The view is stopped before it's sent, so discord.py doesn't keep it in memory per message,
+    and the buttons keep working across restarts.
+    """
+
+    def __init__(self, player: str, ladder: str, current_period: str = "daily"):
+        super().__init__(timeout=None)
+        for period in CANDLE_PERIODS:
+            custom_id = candle_custom_id(period, ladder, player)
+            if len(custom_id) > MAX_CUSTOM_ID_LENGTH:
+                logger.warning(f"Player name too long for candle buttons: {player}")
+                break
+            self.add_item(Button(
+                label=period.capitalize(),
+                style=discord.ButtonStyle.primary if period == current_period else discord.ButtonStyle.secondary,
+                custom_id=custom_id
+            ))
+        self.stop()
+
+
+async def handle_candle_interaction(interaction: discord.Interaction, cnc_api_client, candle_history=None) -> None:
+    """Handle a Daily/Monthly click on any candle message, including ones posted before a restart."""
+    if interaction.type != discord.InteractionType.component:
+        return
+    parsed = parse_candle_custom_id((interaction.data or {}).get("custom_id", ""))
+    if parsed is None:
+        return
+    period, ladder, player = parsed
+
+    # Check cooldown for this specific button
+    cooldown_key = (interaction.user.id, interaction.data["custom_id"])
+    on_cooldown, remaining = button_cooldowns.check(cooldown_key)
+    if on_cooldown:
+        await interaction.response.send_message(
+            f"Please wait {remaining:.0f} seconds before clicking {period.capitalize()} again.",
+            ephemeral=True
+        )
+        return
+    button_cooldowns.touch(cooldown_key)
+
+    await interaction.response.defer()
+
+    stats = await cnc_api_client.fetch_player_stats(ladder, player, period)
+
+    if is_api_unavailable(stats):
+        await interaction.followup.send(api_unavailable_msg(stats), ephemeral=True)
+        return
+
+    if isinstance(stats, Exception):
+        logger.error(f"Exception fetching {period} stats for {player} on {ladder}: {type(stats).__name__}, {str(stats)}")
+        await interaction.followup.send(f"Error: Could not fetch {period} stats for {player}", ephemeral=True)
+        return
+
+    if "error" in stats:
+        logger.error(f"API error fetching {period} stats for {player} on {ladder}: {stats.get('error')}")
+        await interaction.followup.send(f"Error: Could not fetch {period} stats for {player}", ephemeral=True)
+        return
+
+    if period == "daily" and candle_history is not None:
+        await candle_history.record_day(ladder, player, stats, track=True)
+
+    wins = stats.get('wins', 0)
+    losses = stats.get('losses', 0)
+    points = stats.get('points', 0)
+
+    # Build and send updated message, with the clicked period highlighted
+    message = build_candle_message(player, ladder, wins, losses, points, period)
+    await interaction.edit_original_response(content=message, view=CandleView(player, ladder, period))
+
+
+async def candle(ctx, bot, player, ladder, ladders, cnc_api_client, candle_history=None, days=None):
+    """
+    Check a player's daily wins and losses for a specific ladder with interactive period selection.
+    With days set, shows one candle per day for the last `days` days from the recorded history instead.
+    """
     if not player:
-        await ctx.send("Usage: `!candle <player> <ladder>`")
+        await ctx.send("Usage: `!candle <player> <ladder> [days]`")
+        return
+
+    if days is not None and not (2 <= days <= MAX_HISTORY_DAYS):
+        await ctx.send(f"Days must be between 2 and {MAX_HISTORY_DAYS}")
         return
 
     # Case-insensitive ladder matching
@@ -248,7 +299,11 @@ async def candle(ctx, bot, player, ladder, ladders, cnc_api_client):
     ladder_actual = ladder_map[ladder_lower]
 
     # Fetch initial daily stats
-    stats = cnc_api_client.fetch_player_daily_stats(ladder_actual, player)
+    stats = await cnc_api_client.fetch_player_daily_stats(ladder_actual, player)
+
+    if is_api_unavailable(stats):
+        await ctx.send(api_unavailable_msg(stats))
+        return
 
     if isinstance(stats, Exception):
         logger.error(f"Exception fetching daily stats for {player} on {ladder_actual}: {type(stats).__name__}, {str(stats)}")
@@ -260,6 +315,15 @@ async def candle(ctx, bot, player, ladder, ladders, cnc_api_client):
         await ctx.send(f"Error: Could not fetch stats for {player} on {ladder_actual.upper()}")
         return
 
+    if candle_history is not None:
+        await candle_history.record_day(ladder_actual, player, stats, track=True)
+
+    if days is not None:
+        # Today comes from the lookup above, earlier days from the local history, no extra API calls
+        history = await candle_history.get_days(ladder_actual, player, days) if candle_history is not None else []
+        await ctx.send(build_candle_history_message(player, ladder_actual, history, days))
+        return
+
     wins = stats.get('wins', 0)
     losses = stats.get('losses', 0)
     points = stats.get('points', 0)
@@ -268,7 +332,7 @@ async def candle(ctx, bot, player, ladder, ladders, cnc_api_client):
     message = build_candle_message(player, ladder_actual, wins, losses, points, "daily")
 
     # Create the interactive view with buttons
-    view = CandleView(player, ladder_actual, cnc_api_client, initial_period="daily")
+    view = CandleView(player, ladder_actual, current_period="daily")
 
     # Send message with interactive buttons
     await ctx.send(message, view=view)
@@ -1,61 +1,79 @@
-import discord
+import asyncio
+
+from src.constants.constants import ROLE_CREATE_CONCURRENCY
+from src.util.guild_index import normalize_name
 from src.util.logger import MyLogger
-from src.tasks.sync_qm_ranking_roles_task import get_role_name
+from src.util.qm_role_table import QM_ROLE_TABLES, qm_role_names
 from src.util.utils import send_message_to_log_channel
 
 logger = MyLogger("CreateQmRoles")
 
 
 async def create_qm_roles(ctx, bot, ladder):
-    """Create QM ranking roles for a specified ladder."""
+    """
+    Create QM ranking roles for a specified ladder, or with "all" for every ladder
+    configured for the server's role sync.
+    """
     if not ctx.message.author.guild_permissions.administrator:
         logger.error(f"{ctx.message.author} is not admin, exiting command.")
         await ctx.send("You must be an administrator to use this command.")
         return
 
     if not ladder:
-        await ctx.send("Usage: `!create_qm_roles <ladder>` (e.g., `!create_qm_roles YR`)")
+        await ctx.send("Usage: `!create_qm_roles <ladder|all>` (e.g., `!create_qm_roles YR`)")
         return
 
-    ladder = ladder.upper()
     guild = ctx.guild
-
-    # Role ranks to create
-    ranks = [1, 3, 5, 10, 25, 50]
-    created_roles = []
-    existing_roles = []
+    if ladder.lower() == "all":
+        role_table = QM_ROLE_TABLES.get(guild.id)
+        if role_table is None:
+            await ctx.send("No QM role ladders are configured for this server.")
+            return
+        ladders = role_table.ladders
+        title = f"QM Roles for all ladders ({', '.join(ladders)})"
+    else:
+        ladders = [ladder.upper()]
+        title = f"QM Roles for {ladders[0]}"
 
     try:
-        for rank in ranks:
-            role_name = get_role_name(ladder, rank)
-            if not role_name:
-                continue
-
-            # Check if role already exists
-            existing_role = discord.utils.get(guild.roles, name=role_name)
-            if existing_role:
-                existing_roles.append(role_name)
-                logger.debug(f"Role '{role_name}' already exists")
-            else:
-                # Create the role
+        # One role per configured tier (QM_ROLE_TIERS), checked against a single index of the guild's role names
+        existing_names = {normalize_name(role.name) for role in guild.roles}
+        wanted_roles = [role_name for ladder_abbrev in ladders for role_name in qm_role_names(ladder_abbrev)]
+        existing_roles = [role_name for role_name in wanted_roles if normalize_name(role_name) in existing_names]
+        missing_roles = [role_name for role_name in wanted_roles if normalize_name(role_name) not in existing_names]
+
+        semaphore = asyncio.Semaphore(ROLE_CREATE_CONCURRENCY)
+
+        async def create_role(role_name):
+            async with semaphore:
                 await guild.create_role(name=role_name, mentionable=False)
-                created_roles.append(role_name)
                 logger.log(f"Created role '{role_name}'")
 
+        results = await asyncio.gather(*(create_role(role_name) for role_name in missing_roles), return_exceptions=True)
+        created_roles = [role_name for role_name, result in zip(missing_roles, results) if not isinstance(result, Exception)]
+        failed_roles = [
+            (role_name, result) for role_name, result in zip(missing_roles, results) if isinstance(result, Exception)
+        ]
+
         # Build response message
-        response = f"**QM Roles for {ladder}**\n\n"
+        response = f"**{title}**\n\n"
 
         if created_roles:
             response += f"✅ Created {len(created_roles)} role(s):\n"
             for role_name in created_roles:
                 response += f"  • {role_name}\n"
 
+        if failed_roles:
+            response += f"\n❌ Failed to create {len(failed_roles)} role(s):\n"
+            for role_name, error in failed_roles:
+                response += f"  • {role_name}: {error}\n"
+
         if existing_roles:
             response += f"\n⚠️ {len(existing_roles)} role(s) already existed:\n"
             for role_name in existing_roles:
                 response += f"  • {role_name}\n"
 
-        if not created_roles and not existing_roles:
+        if not created_roles and not existing_roles and not failed_roles:
             response += "No roles were created."
 
         await send_message_to_log_channel(bot=bot, msg=response)
@@ -63,4 +81,4 @@ async def create_qm_roles(ctx, bot, ladder):
     except Exception as e:
         error_msg = f"Error creating roles: {str(e)}"
         logger.exception(error_msg)
-        await send_message_to_log_channel(bot=bot, msg=f"❌ {error_msg}")
\ No newline at end of file
+        await send_message_to_log_channel(bot=bot, msg=f"❌ {error_msg}")
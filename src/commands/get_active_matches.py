@@ -1,15 +1,29 @@
 
 
+import asyncio
+import hashlib
 import json
 import time
+from dataclasses import dataclass
 from http.client import HTTPException
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from discord import Forbidden, DiscordServerError, Message
+from discord import Forbidden, DiscordServerError, Message, NotFound
 from discord.ext.commands import Bot
-from src.constants.constants import DEV_DISCORD_ID, DISCORDS
-from src.util.embed import create_embeds
+from src.constants.constants import (
+    DEV_DISCORD_ID,
+    DISCORDS,
+    BOT_CHANNEL_FORCE_REFRESH_MINUTES,
+    SUMMARY_MESSAGE_REGISTRY_PATH,
+    GUILD_UPDATE_CONCURRENCY,
+    GUILD_UPDATE_TIMEOUT_SECONDS,
+    RENDER_MODE_EMBEDS,
+    RENDER_MODE_TABLE
+)
+from src.util.embed import create_embeds, evict_finished_match_embeds
 from src.util.logger import MyLogger
+from src.util.match_table import MatchRow, create_match_rows, format_match_table
+from src.util.message_registry import MessageRegistry
 from src.util.utils import send_message_to_log_channel, get_channel_msgs, is_error, get_exception_msg
 
 logger = MyLogger("GetActiveMatches")  # Logger for this module
@@ -31,18 +45,177 @@ def players_in_queue(ladder_abbrev: str, stats_json: dict, num_active_matches: i
     return f"- **{total_in_qm}** in **{title}** Ladder, **{in_queue}** waiting in queue"
 
 
-last_summary_message_ids: Dict[int, int] = {}  # channel_id -> message_id
+@dataclass
+class RenderedLadder:
+    """
+    A ladder's summary line and its matches, rendered once per tick and shared by every guild listing it.
+    Matches are rendered as embeds or as table rows, depending on the render mode.
+    """
+    summary_line: str
+    embeds: List
+    embed_payloads: List[dict]
+    table_rows: List[MatchRow]
+
+
+def render_ladder(
+    ladder_abbrev: str,
+    stats_json: dict,
+    active_matches_json: dict,
+    render_mode: str = RENDER_MODE_EMBEDS,
+    matches_as_of: Optional[float] = None
+) -> Optional[RenderedLadder]:
+    """
+    Renders the summary line and matches for one ladder, or None if the ladder has no stats.
+    matches_as_of is the fetch time of stale active matches, which match start times are computed from.
+    """
+    if ladder_abbrev not in stats_json:
+        return None
+
+    matches = active_matches_json.get(ladder_abbrev, [])
+    if render_mode == RENDER_MODE_TABLE:
+        embeds = []
+        table_rows = create_match_rows(ladder_abbrev, matches)
+    else:
+        embeds = create_embeds(ladder_abbrev, matches, fetched_at=matches_as_of)
+        table_rows = []
+
+    return RenderedLadder(
+        summary_line=players_in_queue(
+            ladder_abbrev=ladder_abbrev,
+            stats_json=stats_json[ladder_abbrev],
+            num_active_matches=len(matches)
+        ),
+        embeds=embeds,
+        embed_payloads=[embed.to_dict() for embed in embeds],
+        table_rows=table_rows
+    )
+
+
+# Discord limits per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+last_summary_message_ids = MessageRegistry(SUMMARY_MESSAGE_REGISTRY_PATH)  # channel_id -> [message_id per page], persisted to disk
+last_page_digests: Dict[int, Tuple[str, float]] = {}  # message_id -> (digest, written_at)
+
+
+@dataclass
+class BoardPage:
+    """One message of a channel's live board: the summary text (first page only) and up to 10 embeds"""
+    content: Optional[str]
+    embeds: List
+    digest: str
+
+
+def summary_digest(summary_lines: List[str], embed_payloads: List[dict]) -> str:
+    """
+    Returns a stable digest of the rendered summary lines and embed payloads.
+    The "Updated <t:...:R>" line is deliberately excluded so it doesn't count as a change.
+    """
+    payload = json.dumps(
+        {"summary": summary_lines, "embeds": embed_payloads},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stale_data_line(stats_as_of: Optional[float], matches_as_of: Optional[float]) -> Optional[str]:
+    """The board line saying which data is stale and since when, or None if everything is fresh"""
+    if stats_as_of is not None and matches_as_of is not None:
+        return f"*Ladder API unavailable, data as of* <t:{int(min(stats_as_of, matches_as_of))}:R>"
+    if matches_as_of is not None:
+        return f"*Active matches unavailable, matches as of* <t:{int(matches_as_of)}:R>"
+    if stats_as_of is not None:
+        return f"*Queue stats unavailable, stats as of* <t:{int(stats_as_of)}:R>"
+    return None
+
+
+def build_board_pages(
+    summary_lines: List[str],
+    embeds: List,
+    embed_payloads: List[dict],
+    table_rows: Optional[List[MatchRow]] = None,
+    stats_as_of: Optional[float] = None,
+    matches_as_of: Optional[float] = None
+) -> List[BoardPage]:
+    """
+    Splits the board into pages that each fit Discord's per-message embed limits.
+    The first page always exists and carries the summary text, followed by the
+    match table when rendering in table mode. stats_as_of and matches_as_of mark
+    the parts of the board rendered from stale data with the time they were fetched.
+    """
+    chunks: List[Tuple[List, List[dict]]] = []
+    page_embeds: List = []
+    page_payloads: List[dict] = []
+    page_chars = 0
+    for embed, payload in zip(embeds, embed_payloads):
+        embed_chars = len(embed)
+        if page_embeds and (
+            len(page_embeds) >= MAX_EMBEDS_PER_MESSAGE or page_chars + embed_chars > MAX_EMBED_CHARS_PER_MESSAGE
+        ):
+            chunks.append((page_embeds, page_payloads))
+            page_embeds, page_payloads, page_chars = [], [], 0
+        page_embeds.append(embed)
+        page_payloads.append(payload)
+        page_chars += embed_chars
+    if page_embeds or not chunks:
+        chunks.append((page_embeds, page_payloads))
+
+    time_updated_msg = f"*Updated* <t:{int(time.time())}:R>"
+    content_lines = list(summary_lines)
+    stale_line = stale_data_line(stats_as_of, matches_as_of)
+    if stale_line:
+        # Part of the digest, so the board is edited once when it goes stale rather than every tick
+        content_lines.insert(0, stale_line)
+    if table_rows:
+        # Whatever room the summary leaves in the 2000 character message goes to the table
+        max_table_chars = 2000 - len("\n".join(content_lines)) - len(time_updated_msg) - 2
+        content_lines.append(format_match_table(table_rows, max_table_chars))
+    summary_text = "\n".join(content_lines) + "\n" + time_updated_msg
+
+    pages = []
+    for index, (page_embeds, page_payloads) in enumerate(chunks):
+        if index == 0:
+            pages.append(BoardPage(summary_text[:2000], page_embeds, summary_digest(content_lines, page_payloads)))
+        else:
+            pages.append(BoardPage(None, page_embeds, summary_digest([], page_payloads)))
+    return pages
+
+
+def is_page_unchanged(message_id: int, digest: str, force_refresh: bool) -> bool:
+    """
+    Returns True if the message already shows this digest and, when force_refresh is set,
+    isn't yet due for a refresh of its "Updated" timestamp.
+    """
+    cached = last_page_digests.get(message_id)
+    if not cached:
+        return False
+
+    cached_digest, written_at = cached
+    if cached_digest != digest:
+        return False
+
+    force_refresh_seconds = BOT_CHANNEL_FORCE_REFRESH_MINUTES * 60
+    if not force_refresh or force_refresh_seconds <= 0:
+        return True
+    return time.time() - written_at < force_refresh_seconds
 
 
 async def fetch_active_qms(
     bot: Bot,
     stats_json: dict,
     active_matches_json: dict,
-    debug: bool
+    debug: bool,
+    stats_as_of: Optional[float] = None,
+    matches_as_of: Optional[float] = None
 ) -> None:
     """
     Updates Discord channel messages with current queue and match info for each ladder.
     Aggregates all ladder info into a single message and updates it in the target channel.
+    Guilds are updated concurrently (bounded by GUILD_UPDATE_CONCURRENCY), each with its own timeout,
+    so one slow or failing guild doesn't hold up the others.
+    stats_as_of / matches_as_of are set when that part is served from the last good snapshot
+    during an API outage, and hold the time it was fetched.
     """
     logger.debug(f"Fetching active qms with debug={debug}...")
 
@@ -51,6 +224,12 @@ async def fetch_active_qms(
         await send_message_to_log_channel(bot=bot, msg=fail_msg)
         return
 
+    evict_finished_match_embeds(active_matches_json)
+
+    # Each ladder is rendered at most once per tick and render mode, then assembled per guild
+    rendered_ladders: Dict[Tuple[str, str], Optional[RenderedLadder]] = {}
+
+    servers = []
     for server in bot.guilds:
         if (server.id == DEV_DISCORD_ID) != debug:
             continue
@@ -60,78 +239,180 @@ async def fetch_active_qms(
             logger.warning(f"Unexpected server ID: {server.id} (server name: {server.name}) ... skipping")
             continue
 
-        ladder_abbrev_arr: List[str] = server_info["ladders"]
-        qm_bot_channel = bot.get_channel(server_info["qm_bot_channel_id"])
+        servers.append((server, server_info))
 
-        if not qm_bot_channel:
-            logger.error(f"Channel not found for {server.name}: {server_info['qm_bot_channel_id']}")
-            continue
+    semaphore = asyncio.Semaphore(GUILD_UPDATE_CONCURRENCY)
 
-        # Aggregate all ladder info into one message
-        summary_lines: List[str] = []
-        all_embeds: List = []
-        for ladder_abbrev in ladder_abbrev_arr:
-            if ladder_abbrev not in stats_json:
-                summary_lines = [
-                    "Active Ladder stats are temporarily unavailable. Alert admins if this persists."
-                ]
-                break
-            else:
-                msg = players_in_queue(
-                    ladder_abbrev=ladder_abbrev,
-                    stats_json=stats_json[ladder_abbrev],
-                    num_active_matches=len(active_matches_json.get(ladder_abbrev, []))
-                )
-                summary_lines.append(msg)
-                all_embeds.extend(create_embeds(ladder_abbrev, active_matches_json.get(ladder_abbrev, [])))
-
-        time_updated_msg = f"*Updated* <t:{int(time.time())}:R>"
-        summary_text = "\n".join(summary_lines) + "\n" + time_updated_msg
-
-        # Use cached message ID if available
-        bot_message: Optional[Message] = None
-        channel_id = qm_bot_channel.id
-        message_id = last_summary_message_ids.get(channel_id)
-        if message_id:
-            try:
-                bot_message = await qm_bot_channel.fetch_message(message_id)
-            except Exception:
-                bot_message = None  # Message may have been deleted
-                logger.debug(f"Cached message {message_id} not found in channel {channel_id}, will send new message")
-
-        sent_msg = None
-        try:
-            if bot_message:
-                await bot_message.edit(content=summary_text[:2000], embeds=all_embeds)
-            else:
-                sent_msg = await qm_bot_channel.send(content=summary_text[:2000], embeds=all_embeds)
-        except Exception as e:
-            # Only clear cache if message is permanently gone (404), not for transient errors (503, 500, etc)
-            if bot_message and channel_id in last_summary_message_ids:
-                # Check if it's a "message not found" error (404)
-                is_not_found = (
-                    hasattr(e, 'status') and e.status == 404
-                ) or (
-                    'Unknown Message' in str(e) or '404' in str(e)
-                )
-                if is_not_found:
-                    logger.warning(f"Message {message_id} not found in channel {channel_id}, clearing cache")
-                    del last_summary_message_ids[channel_id]
-                else:
-                    logger.warning(f"Transient error editing message {message_id}, keeping cache for retry")
-
-            operation = f"edit message {message_id}" if bot_message else "send new message"
-            error_msg = (
-                f"**Error:** Failed to {operation} in '{server.name}.{qm_bot_channel.name}' (channel_id: {channel_id})\n"
-                f"**Cause:** {get_exception_msg(e)}"
+    async def update_with_limit(server, server_info) -> str:
+        async with semaphore:
+            return await asyncio.wait_for(
+                update_guild_channel(
+                    bot, server, server_info, stats_json, active_matches_json, rendered_ladders, stats_as_of,
+                    matches_as_of
+                ),
+                timeout=GUILD_UPDATE_TIMEOUT_SECONDS
             )
+
+    results = await asyncio.gather(
+        *(update_with_limit(server, server_info) for server, server_info in servers),
+        return_exceptions=True
+    )
+
+    # Report per-guild outcomes; failures in one guild never stop the others
+    for (server, _), result in zip(servers, results):
+        if isinstance(result, asyncio.TimeoutError):
+            error_msg = f"**Error:** Updating '{server.name}' timed out after {GUILD_UPDATE_TIMEOUT_SECONDS}s"
+            logger.error(error_msg)
+            await send_message_to_log_channel(bot=bot, msg=error_msg)
+        elif isinstance(result, Exception):
+            error_msg = f"**Error:** Unexpected failure updating '{server.name}'\n**Cause:** {get_exception_msg(result)}"
             logger.error(error_msg)
             await send_message_to_log_channel(bot=bot, msg=error_msg)
-        finally:
-            # CRITICAL: If we successfully sent a new message, cache its ID no matter what
-            if sent_msg is not None:
-                last_summary_message_ids[channel_id] = sent_msg.id
-                logger.debug(f"Cached new message ID {sent_msg.id} for channel {channel_id}")
+        else:
+            logger.debug(f"'{server.name}': {result}")
 
     logger.debug("Completed fetching active matches.")
 
+
+async def update_guild_channel(
+    bot: Bot,
+    server,
+    server_info: dict,
+    stats_json: dict,
+    active_matches_json: dict,
+    rendered_ladders: Dict[Tuple[str, str], Optional[RenderedLadder]],
+    stats_as_of: Optional[float] = None,
+    matches_as_of: Optional[float] = None
+) -> str:
+    """
+    Renders and writes the summary message for a single guild's bot channel.
+    The guild's "render_mode" picks between match embeds (default) and a compact text table.
+
+    Returns:
+        A short description of what was done, for per-guild logging
+    """
+    ladder_abbrev_arr: List[str] = server_info["ladders"]
+    qm_bot_channel = bot.get_channel(server_info["qm_bot_channel_id"])
+
+    if not qm_bot_channel:
+        logger.error(f"Channel not found for {server.name}: {server_info['qm_bot_channel_id']}")
+        return "channel not found"
+
+    render_mode = server_info.get("render_mode", RENDER_MODE_EMBEDS)
+
+    # Aggregate all ladder info into one board
+    summary_lines: List[str] = []
+    all_embeds: List = []
+    embed_payloads: List[dict] = []
+    table_rows: List[MatchRow] = []
+    for ladder_abbrev in ladder_abbrev_arr:
+        render_key = (ladder_abbrev, render_mode)
+        if render_key not in rendered_ladders:
+            rendered_ladders[render_key] = render_ladder(
+                ladder_abbrev, stats_json, active_matches_json, render_mode, matches_as_of
+            )
+        rendered = rendered_ladders[render_key]
+
+        if rendered is None:
+            summary_lines = [
+                "Active Ladder stats are temporarily unavailable. Alert admins if this persists."
+            ]
+            break
+        else:
+            summary_lines.append(rendered.summary_line)
+            all_embeds.extend(rendered.embeds)
+            embed_payloads.extend(rendered.embed_payloads)
+            table_rows.extend(rendered.table_rows)
+
+    pages = build_board_pages(summary_lines, all_embeds, embed_payloads, table_rows, stats_as_of, matches_as_of)
+    return await write_board_pages(bot, server, qm_bot_channel, pages)
+
+
+async def write_board_pages(bot: Bot, server, qm_bot_channel, pages: List[BoardPage]) -> str:
+    """
+    Brings the channel's board messages in line with pages, touching only what changed:
+    unchanged pages are skipped, changed pages are edited in place, missing pages are sent
+    and pages that are no longer needed are deleted.
+
+    Returns:
+        A short description of what was done, for per-guild logging
+    """
+    channel_id = qm_bot_channel.id
+    old_ids = last_summary_message_ids.get(channel_id)
+    new_ids: List[int] = []
+    deleted_ids: List[int] = []
+    edited = sent = 0
+
+    # Once a page has to be sent as a new message it lands at the bottom of the channel,
+    # so every later page is sent after it too, to keep the pages in order
+    appending = False
+    message_id = None
+    completed = False
+    try:
+        for index, page in enumerate(pages):
+            message_id = None if appending or index >= len(old_ids) else old_ids[index]
+
+            if message_id and is_page_unchanged(message_id, page.digest, force_refresh=index == 0):
+                new_ids.append(message_id)
+                continue
+
+            if message_id:
+                # Edit through a partial message built from the cached ID, no fetch_message round trip needed
+                try:
+                    await qm_bot_channel.get_partial_message(message_id).edit(content=page.content, embeds=page.embeds)
+                    last_page_digests[message_id] = (page.digest, time.time())
+                    new_ids.append(message_id)
+                    edited += 1
+                    continue
+                except NotFound:
+                    # Message is permanently gone, fall through and send a replacement
+                    logger.warning(f"Message {message_id} not found in channel {channel_id}, sending new message")
+                    last_page_digests.pop(message_id, None)
+                    message_id = None
+
+            appending = True
+            sent_msg = await qm_bot_channel.send(content=page.content, embeds=page.embeds)
+            last_page_digests[sent_msg.id] = (page.digest, time.time())
+            new_ids.append(sent_msg.id)
+            sent += 1
+            logger.debug(f"Sent page {index + 1} as message {sent_msg.id} in channel {channel_id}")
+
+        # Delete pages that are no longer needed (matches ended) or were replaced
+        for message_id in old_ids:
+            if message_id in new_ids:
+                continue
+            last_page_digests.pop(message_id, None)
+            try:
+                await qm_bot_channel.get_partial_message(message_id).delete()
+            except NotFound:
+                pass
+            deleted_ids.append(message_id)
+        message_id = None
+        completed = True
+    except Exception as e:
+        operation = f"update message {message_id}" if message_id else "update board"
+        error_msg = (
+            f"**Error:** Failed to {operation} in '{server.name}.{qm_bot_channel.name}' (channel_id: {channel_id})\n"
+            f"**Cause:** {get_exception_msg(e)}"
+        )
+        logger.error(error_msg)
+        await send_message_to_log_channel(bot=bot, msg=error_msg)
+        return f"failed to {operation}"
+    finally:
+        if not completed:
+            # Interrupted by an error or by the guild timeout cancelling us (CancelledError isn't an
+            # Exception): keep the old IDs not yet replaced or deleted so the next tick edits them
+            # instead of posting a second board. Message IDs are snowflakes, so sorting them restores
+            # the order the pages appear in the channel.
+            # A send() cancelled mid-flight may still have posted its message, but its ID never
+            # reached us; cleanup_duplicate_messages_task deletes such untracked bot messages.
+            new_ids = sorted(set(new_ids) | {m for m in old_ids if m not in deleted_ids})
+            if message_id:
+                last_page_digests.pop(message_id, None)
+        # CRITICAL: Messages we sent must be cached no matter what, or they'd be orphaned as duplicates
+        last_summary_message_ids[channel_id] = new_ids
+
+    if not (edited or sent or deleted_ids):
+        logger.debug(f"Board unchanged for '{server.name}.{qm_bot_channel.name}', skipping edit")
+        return "unchanged"
+    return f"{len(pages)} page(s): {edited} edited, {sent} sent, {len(deleted_ids)} deleted"
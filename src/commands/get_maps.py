@@ -1,5 +1,6 @@
 from src.util.logger import MyLogger
-from src.util.utils import send_message_to_log_channel, is_error, get_exception_msg
+from src.util.utils import send_message_to_log_channel, is_error, get_exception_msg, is_api_unavailable, \
+    api_unavailable_msg
 
 logger = MyLogger("GetMaps")
 
@@ -21,7 +22,11 @@ async def get_maps(ctx, bot, arg, ladders, cnc_api_client):
         await ctx.send(f"{arg.lower()} is not a valid ladder from `{ladders_string}`")
         return
 
-    maps_json = cnc_api_client.fetch_maps(arg.lower())
+    maps_json = await cnc_api_client.fetch_maps(arg.lower())
+
+    if is_api_unavailable(maps_json):
+        await ctx.send(api_unavailable_msg(maps_json))
+        return
 
     if is_error(maps_json):
         await ctx.send(f"Error fetching maps for ladder {arg.lower()}")
@@ -6,27 +6,65 @@ CNCNET_DISCORD_ID = 188156159620939776
 BLITZ_DISCORD_ID = 818265922615377971
 DEV_DISCORD_ID = 1089195585984286860
 
+# How a guild's ladder-bot channel renders active matches
+RENDER_MODE_EMBEDS = "embeds"  # One embed per match, paged across messages
+RENDER_MODE_TABLE = "table"  # One compact code-block table inside the summary message, no embeds
+
 # discords where this bot resides
 DISCORDS = {
     YR_DISCORD_ID:
         {
             "qm_bot_channel_id": 1039026321826787338,
-            "ladders": ["ra2", "yr", "blitz", "blitz-2v2", "ra2-2v2"]
+            "ladders": ["ra2", "yr", "blitz", "blitz-2v2", "ra2-2v2"],
+            "render_mode": RENDER_MODE_EMBEDS,
+            "qm_role_ladders": ["RA2", "YR", "BLITZ-2V2", "RA2-2V2"]  # Ladders synced to QM ranking roles
         },
     CNCNET_DISCORD_ID:
         {
             "qm_bot_channel_id": 1039608594057924609,
-            "ladders": ["d2k", "ra", "ra-2v2", "ra2", "ra2-2v2", "yr", "blitz", "blitz-2v2"]
+            "ladders": ["d2k", "ra", "ra-2v2", "ra2", "ra2-2v2", "yr", "blitz", "blitz-2v2"],
+            "render_mode": RENDER_MODE_EMBEDS
         },
     DEV_DISCORD_ID:
         {
             "qm_bot_channel_id": 1373149510372560987,
-            "ladders": ["ra2", "yr", "blitz", "blitz-2v2"]
+            "ladders": ["ra2", "yr", "blitz", "blitz-2v2"],
+            "render_mode": RENDER_MODE_EMBEDS
         }
 }
 
 QM_BOT_CHANNEL_NAME = "ladder-bot"
 
+# QM ranking role tiers as (last rank in the tier, role name suffix), best tier first: a tier covers
+# the ranks after the previous tier's last rank up to and including its own, e.g. (5, "QM Top 5") is ranks 4-5.
+# Role names are "<LADDER> <suffix>", guilds opt in with "qm_role_ladders" in DISCORDS.
+QM_ROLE_TIERS = [
+    (1, "QM Rank 1"),
+    (3, "QM Top 3"),
+    (5, "QM Top 5"),
+    (10, "QM Top 10"),
+    (25, "QM Top 25"),
+    (50, "QM Top 50"),
+]
+
+# Directory for state persisted across restarts
+DATA_DIR = "data"
+SUMMARY_MESSAGE_REGISTRY_PATH = f"{DATA_DIR}/summary_messages.json"
+LADDER_CACHE_PATH = f"{DATA_DIR}/ladder_cache.json"  # Ladder list and map pools
+LIVE_SNAPSHOT_PATH = f"{DATA_DIR}/live_snapshot.json"  # Last good stats and active matches
+CANDLE_HISTORY_PATH = f"{DATA_DIR}/candle_history.db"  # Per-player daily W/L for multi-day candles
+IDENTITY_CACHE_PATH = f"{DATA_DIR}/discord_identities.json"  # Ranked player -> Discord user ID
+
+# Unchanged bot channel messages are still re-edited this often to keep the "Updated" timestamp fresh (0 = never)
+BOT_CHANNEL_FORCE_REFRESH_MINUTES = 10
+
+# Bot channel updates run concurrently across guilds, at most this many at once, each with its own timeout
+GUILD_UPDATE_CONCURRENCY = 4
+GUILD_UPDATE_TIMEOUT_SECONDS = 20
+
+# create_qm_roles creates at most this many roles at once
+ROLE_CREATE_CONCURRENCY = 5
+
 # UI interaction settings
 BUTTON_COOLDOWN_SECONDS = 10  # Per-button, per-user cooldown for interactive commands
 
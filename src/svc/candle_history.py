@@ -0,0 +1,169 @@
+"""Local SQLite store of per-player daily W/L and points, for multi-day candles"""
+import asyncio
+import sqlite3
+import time
+from contextlib import closing
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.util.logger import MyLogger
+
+logger = MyLogger("CandleHistory")
+
+DailyCandle = Tuple[str, int, int, int]  # (YYYY-MM-DD, wins, losses, points)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_candles (
+    ladder TEXT NOT NULL,
+    player TEXT NOT NULL,
+    day TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ladder, player, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tracked_players (
+    ladder TEXT NOT NULL,
+    player TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    last_lookup REAL NOT NULL,
+    PRIMARY KEY (ladder, player)
+) WITHOUT ROWID;
+"""
+
+
+class CandleHistoryStore:
+    """
+    One row per (ladder, player, UTC day) holding that day's latest W/L and points,
+    plus the players that have been looked up and should keep being recorded.
+
+    SQLite calls are blocking, so every public method runs them in a worker thread.
+    """
+
+    def __init__(self, path: str, retention_days: int = 90):
+        """
+        Initialize the store. The database file is created on first use.
+
+        Args:
+            path: SQLite database file
+            retention_days: Days of history kept, older rows are pruned
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.path)) as conn:
+                conn.executescript(SCHEMA)
+            self._initialized = True
+        return sqlite3.connect(self.path)
+
+    def _record(self, ladder: str, player: str, day: str, wins: int, losses: int, points: int, track: bool) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO daily_candles (ladder, player, day, wins, losses, points, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (ladder, player, day) DO UPDATE SET "
+                "wins = excluded.wins, losses = excluded.losses, points = excluded.points, "
+                "updated_at = excluded.updated_at",
+                (ladder.lower(), player.lower(), day, wins, losses, points, now)
+            )
+            if track:
+                conn.execute(
+                    "INSERT INTO tracked_players (ladder, player, player_name, last_lookup) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (ladder, player) DO UPDATE SET "
+                    "player_name = excluded.player_name, last_lookup = excluded.last_lookup",
+                    (ladder.lower(), player.lower(), player, now)
+                )
+
+    def _get_days(self, ladder: str, player: str, first_day: str) -> List[DailyCandle]:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT day, wins, losses, points FROM daily_candles "
+                "WHERE ladder = ? AND player = ? AND day >= ? ORDER BY day",
+                (ladder.lower(), player.lower(), first_day)
+            ).fetchall()
+
+    def _tracked_players(self, since: float, limit: int) -> List[Tuple[str, str]]:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT ladder, player_name FROM tracked_players WHERE last_lookup >= ? "
+                "ORDER BY last_lookup DESC LIMIT ?",
+                (since, limit)
+            ).fetchall()
+
+    def _prune(self, oldest_day: str, oldest_lookup: float) -> int:
+        with closing(self._connect()) as conn, conn:
+            deleted = conn.execute("DELETE FROM daily_candles WHERE day < ?", (oldest_day,)).rowcount
+            conn.execute("DELETE FROM tracked_players WHERE last_lookup < ?", (oldest_lookup,))
+        return deleted
+
+    async def record_day(
+        self,
+        ladder: str,
+        player: str,
+        stats: dict,
+        day: Optional[date] = None,
+        track: bool = False
+    ) -> None:
+        """
+        Store a player's daily stats as the rollup for day, replacing any earlier value for that day.
+
+        Args:
+            ladder: Ladder abbreviation
+            player: Player name
+            stats: Daily stats JSON from the API
+            day: UTC day the stats belong to (today by default)
+            track: Whether this was a user lookup, which keeps the player tracked for background recording
+        """
+        day = day or utc_today()
+        try:
+            await asyncio.to_thread(
+                self._record, ladder, player, day.isoformat(),
+                stats.get('wins', 0), stats.get('losses', 0), stats.get('points', 0), track
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record candle history for {player} on {ladder}: {e}")
+
+    async def get_days(self, ladder: str, player: str, days: int) -> List[DailyCandle]:
+        """
+        Return the recorded days of the last `days` UTC days (today included), oldest first.
+        Days without a recording are not returned.
+        """
+        first_day = (utc_today() - timedelta(days=days - 1)).isoformat()
+        try:
+            return await asyncio.to_thread(self._get_days, ladder, player, first_day)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read candle history for {player} on {ladder}: {e}")
+            return []
+
+    async def tracked_players(self, max_age_days: int, limit: int) -> List[Tuple[str, str]]:
+        """Return (ladder, player_name) for players looked up within max_age_days, most recent first"""
+        since = time.time() - max_age_days * 86400
+        try:
+            return await asyncio.to_thread(self._tracked_players, since, limit)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read tracked candle players: {e}")
+            return []
+
+    async def prune(self, tracked_max_age_days: int) -> None:
+        """Drop days past the retention window and players nobody has looked up for tracked_max_age_days"""
+        oldest_day = (utc_today() - timedelta(days=self.retention_days)).isoformat()
+        oldest_lookup = time.time() - tracked_max_age_days * 86400
+        try:
+            deleted = await asyncio.to_thread(self._prune, oldest_day, oldest_lookup)
+            if deleted:
+                logger.debug(f"Pruned {deleted} candle history rows older than {oldest_day}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to prune candle history: {e}")
+
+
+def utc_today() -> date:
+    """Current UTC date, the day boundary the ladder's daily stats reset on"""
+    return datetime.now(timezone.utc).date()
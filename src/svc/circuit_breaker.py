@@ -0,0 +1,107 @@
+"""Per-endpoint circuit breaker with jittered exponential backoff"""
+import random
+import time
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Returned instead of making a request while an endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit for '{endpoint}' is open, retry in {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of one endpoint and stops calling it while it's down.
+
+    closed:    requests go through; failure_threshold failures in a row open the circuit
+    open:      requests fail fast until the backoff has elapsed
+    half_open: a single probe request is let through; success closes the circuit,
+               failure reopens it with the backoff doubled (up to max_backoff)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        jitter: float = 0.2
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            base_backoff: Seconds the circuit stays open the first time
+            max_backoff: Upper bound for the doubled backoff
+            jitter: Fraction the backoff is randomly varied by, so endpoints don't retry in lockstep
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0  # Consecutive openings without a success, drives the backoff
+        self.open_until = 0.0
+        self._probe_in_flight = False
+
+    def before_request(self) -> Optional[float]:
+        """
+        Decide whether a request may be made now.
+
+        Returns:
+            None if the request may go ahead, otherwise the seconds until the next attempt is allowed
+        """
+        if self.state == CLOSED:
+            return None
+
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now < self.open_until:
+                return self.open_until - now
+            self.state = HALF_OPEN
+
+        # Half-open: only one probe at a time, everyone else keeps failing fast
+        if self._probe_in_flight:
+            return max(self.open_until - now, 1.0)
+        self._probe_in_flight = True
+        return None
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request"""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit when the threshold is reached or a probe failed"""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release_probe(self) -> None:
+        """Let another probe through when a probe ended without an outcome (e.g. it was cancelled)"""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.times_opened += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.times_opened - 1))
+        backoff *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.state = OPEN
+        self.open_until = time.monotonic() + backoff
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a request through again (0 when closed)"""
+        if self.state == CLOSED:
+            return 0.0
+        return max(self.open_until - time.monotonic(), 0.0)
@@ -1,59 +1,333 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
 
-import requests
+import aiohttp
+from src.svc.circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+from src.svc.rate_limiter import TokenBucket
+from src.svc.snapshot_store import SnapshotStore
+from src.svc.ttl_cache import TTLCache
 from src.util.logger import MyLogger
 
 logger = MyLogger("CnCNetApiSvc")
 
+
+@dataclass
+class LiveSnapshot:
+    """
+    Stats and active matches fetched together for one polling tick.
+
+    Either field may hold an exception instead of JSON, so callers can
+    still render queue counts when only the active matches call failed.
+    as_of is only set on snapshots served from the last known good copy.
+    """
+    stats_json: Any
+    active_matches_json: Any
+    as_of: Optional[float] = None
+
+    @property
+    def stats_ok(self) -> bool:
+        return not isinstance(self.stats_json, Exception)
+
+    @property
+    def active_matches_ok(self) -> bool:
+        return not isinstance(self.active_matches_json, Exception)
+
+
 class CnCNetApiSvc:
     host = "https://ladder.cncnet.org"
-    timeout = 20  # seconds
+    timeout = 20  # seconds, total time allowed per request
+    connect_timeout = 5  # seconds, time allowed to establish a connection
+    max_connections = 10  # pooled keep-alive connections to the ladder host
+    keepalive_timeout = 60  # seconds an idle pooled connection is kept open
+
+    # Seconds a successful response stays cached, per endpoint (0 disables caching)
+    DEFAULT_CACHE_TTLS = {
+        "stats": 15,
+        "active_matches": 15,
+        "player_stats": 60,
+    }
+    player_stats_cache_size = 512  # (ladder, player, period) entries kept for the candle command
+
+    # Seconds before a persisted map pool is revalidated against the API in the background
+    maps_revalidate_seconds = 15 * 60
+
+    # Per-endpoint circuit breaker: consecutive failures before failing fast, and the open backoff range
+    breaker_failure_threshold = 3
+    breaker_base_backoff = 5  # seconds, doubled on every failed probe
+    breaker_max_backoff = 300  # seconds
 
-    def get_json(self, url):
+    # Outbound request budgets (requests per second, burst). Interactive commands get their own
+    # bucket so a burst of button clicks can never starve the background polling tasks.
+    background_rate_per_second = 2
+    background_burst = 10
+    interactive_rate_per_second = 1
+    interactive_burst = 5
+    interactive_max_wait = 2  # seconds a command waits for a token before giving up
+    INTERACTIVE_ENDPOINTS = {"player_stats", "maps"}
+
+    def __init__(
+        self,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        live_snapshot_store: Optional[SnapshotStore] = None
+    ):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache_ttls = {**self.DEFAULT_CACHE_TTLS, **(cache_ttls or {})}
+        self._cache = TTLCache()
+        self._player_stats_cache = TTLCache(max_entries=self.player_stats_cache_size)
+        self.snapshot_store = snapshot_store
+        self.live_snapshot_store = live_snapshot_store
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._background_bucket = TokenBucket("background", self.background_rate_per_second, self.background_burst)
+        self._interactive_bucket = TokenBucket(
+            "interactive", self.interactive_rate_per_second, self.interactive_burst
+        )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+                raise_for_status=True
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its pooled connections."""
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _breaker(self, endpoint) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.breaker_failure_threshold,
+                base_backoff=self.breaker_base_backoff,
+                max_backoff=self.breaker_max_backoff
+            )
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Return the state of every endpoint circuit that isn't closed"""
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items() if breaker.state != CLOSED}
+
+    async def get_json(self, url, endpoint="default", interactive=None):
+        """
+        Fetch JSON from url, returning the exception instead of raising on failure.
+        While the endpoint's circuit is open this returns a CircuitOpenError immediately.
+        Every request takes a token from the endpoint's budget first. Background requests
+        wait for one, interactive ones return a RateLimitedError after interactive_max_wait.
+        interactive defaults to whether the endpoint is one of INTERACTIVE_ENDPOINTS.
+        """
+        breaker = self._breaker(endpoint)
+        retry_after = breaker.before_request()
+        if retry_after is not None:
+            logger.debug(f"Circuit open for '{endpoint}', failing fast: URL: {url}")
+            return CircuitOpenError(endpoint, retry_after)
+
+        if interactive is None:
+            interactive = endpoint in self.INTERACTIVE_ENDPOINTS
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"RequestException: {type(e).__name__}, URL: {url}, Message: {str(e)}, Args: {e.args}")
-            return e
-
-    def fetch_stats(self, ladder):
+            if interactive:
+                rate_limited = await self._interactive_bucket.acquire(max_wait=self.interactive_max_wait)
+            else:
+                rate_limited = await self._background_bucket.acquire()
+            if rate_limited is not None:
+                logger.warning(f"{rate_limited}: URL: {url}")
+                return rate_limited
+
+            try:
+                session = await self._get_session()
+                async with session.get(url) as response:
+                    result = await response.json(content_type=None)
+            except asyncio.TimeoutError as e:
+                breaker.record_failure()
+                logger.error(f"TimeoutError: URL: {url}, timed out after {self.timeout}s")
+                return e
+            except (aiohttp.ClientError, ValueError) as e:
+                # A 4xx means the API is up and answered, only server and transport errors count against it
+                if isinstance(e, aiohttp.ClientResponseError) and e.status < 500:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                logger.error(f"RequestException: {type(e).__name__}, URL: {url}, Message: {str(e)}, Args: {e.args}")
+                return e
+            except Exception as e:
+                # e.g. OSError from a closing transport or RuntimeError from a closed session
+                breaker.record_failure()
+                logger.error(f"Unexpected {type(e).__name__}: URL: {url}, Message: {str(e)}")
+                return e
+
+            breaker.record_success()
+            return result
+        finally:
+            # Whatever happened (rate limited, cancelled, ...), never leave a half-open probe claimed
+            breaker.release_probe()
+
+    async def get_json_cached(self, endpoint, url):
+        """
+        Fetch JSON through the shared cache using the TTL configured for the endpoint.
+        Concurrent callers for the same URL share one in-flight request.
+        """
+        ttl = self.cache_ttls.get(endpoint, 0)
+        return await self._cache.get_or_fetch(url, ttl, lambda: self.get_json(url, endpoint))
+
+    async def get_json_persisted(self, endpoint, key, url):
+        """
+        Fetch JSON and, on success, store it as the last known good snapshot under key.
+        """
+        result = await self.get_json_cached(endpoint, url)
+        if self.snapshot_store is not None and not isinstance(result, Exception):
+            await self.snapshot_store.put(key, result)
+        return result
+
+    async def get_json_stale_while_revalidate(self, endpoint, key, url, max_age):
+        """
+        Serve the persisted snapshot for key straight away, refreshing it in the background once it's
+        older than max_age seconds. Only waits on the API when nothing has been stored yet.
+        """
+        cached = self.cached_snapshot(key)
+        if cached is None:
+            return await self.get_json_persisted(endpoint, key, url)
+
+        data, fetched_at = cached
+        if time.time() - fetched_at > max_age:
+            self.revalidate_in_background(endpoint, key, url)
+        return data
+
+    def revalidate_in_background(self, endpoint, key, url) -> None:
+        """Refresh the snapshot for key without waiting on it (at most one refresh per key at a time)"""
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        async def revalidate():
+            try:
+                await self.get_json_persisted(endpoint, key, url)
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.ensure_future(revalidate())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def cached_snapshot(self, key):
+        """
+        Return the last known good snapshot for key.
+
+        Returns:
+            Tuple of (data, fetched_at unix timestamp), or None
+        """
+        if self.snapshot_store is None:
+            return None
+        return self.snapshot_store.get(key)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return hit, miss and coalesce counters for the response caches, plus rate limited requests"""
+        player_stats = {f"player_stats_{name}": value for name, value in self._player_stats_cache.stats().items()}
+        return {**self._cache.stats(), **player_stats, "rate_limited": self._interactive_bucket.rejected}
+
+    async def fetch_stats(self, ladder):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/stats"
-        return self.get_json(url)
+        return await self.get_json_cached("stats", url)
+
+    async def fetch_live_snapshot(self, ladder="all") -> LiveSnapshot:
+        """
+        Fetch stats and active matches concurrently and return them as one snapshot.
+        A fully successful snapshot is kept as the last known good copy for cached_live_snapshot().
+        """
+        stats_json, active_matches_json = await asyncio.gather(
+            self.fetch_stats(ladder),
+            self.active_matches(ladder)
+        )
+        snapshot = LiveSnapshot(stats_json=stats_json, active_matches_json=active_matches_json)
+        if self.live_snapshot_store is not None and snapshot.stats_ok and snapshot.active_matches_ok:
+            await self.live_snapshot_store.put(
+                f"live:{ladder}",
+                {"stats": stats_json, "active_matches": active_matches_json}
+            )
+        return snapshot
+
+    def cached_live_snapshot(self, ladder="all", max_age=None) -> Optional[LiveSnapshot]:
+        """
+        Return the last fully successful live snapshot.
+
+        Args:
+            ladder: Ladder the snapshot was fetched for
+            max_age: Maximum age in seconds, older snapshots are not returned (None for no limit)
+
+        Returns:
+            LiveSnapshot with as_of set to its fetch time, or None
+        """
+        if self.live_snapshot_store is None:
+            return None
+        cached = self.live_snapshot_store.get(f"live:{ladder}")
+        if cached is None:
+            return None
+
+        data, fetched_at = cached
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        return LiveSnapshot(stats_json=data["stats"], active_matches_json=data["active_matches"], as_of=fetched_at)
 
-    def fetch_ladders(self):
+    async def fetch_ladders(self):
         url = f"{self.host}/api/v1/ladder"
-        return self.get_json(url)
+        return await self.get_json_persisted("ladders", "ladders", url)
 
-    def fetch_maps(self, ladder):
+    async def fetch_maps(self, ladder):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/maps/public"
-        return self.get_json(url)
+        return await self.get_json_stale_while_revalidate(
+            "maps", f"maps:{ladder}", url, self.maps_revalidate_seconds
+        )
 
-    def fetch_pros(self, ladder):
+    async def fetch_pros(self, ladder):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/pros"
-        return self.get_json(url)
+        return await self.get_json(url, "pros")
 
-    def active_matches(self, ladder):
+    async def active_matches(self, ladder):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/active_matches"
-        return self.get_json(url)
+        return await self.get_json_cached("active_matches", url)
 
-    def fetch_rankings(self):
+    async def fetch_rankings(self):
         url = f"{self.host}/api/v1/qm/ladder/rankings"
-        return self.get_json(url)
+        return await self.get_json(url, "rankings")
 
-    def fetch_errored_games(self, ladder):
+    async def fetch_errored_games(self, ladder):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/erroredGames"
-        return self.get_json(url)
+        return await self.get_json(url, "errored_games")
 
-    def fetch_recently_washed_games(self, ladder, hours):
+    async def fetch_recently_washed_games(self, ladder, hours):
         url = f"{self.host}/api/v1/qm/ladder/{ladder}/{hours}/recentlyWashedGames"
-        return self.get_json(url)
+        return await self.get_json(url, "washed_games")
 
-    def fetch_player_daily_stats(self, ladder, player):
-        url = f"{self.host}/api/v1/ladder/{ladder}/player/{player}/today"
-        return self.get_json(url)
+    async def fetch_player_stats(self, ladder, player, period, interactive=True):
+        """
+        Fetch a player's "daily" or "monthly" stats through a short-TTL cache keyed by (ladder, player, period).
+        Everyone clicking the same candle within the TTL shares one API call.
+        Background callers pass interactive=False to use the background request budget.
+        """
+        path = "today" if period == "daily" else "month"
+        url = f"{self.host}/api/v1/ladder/{ladder}/player/{player}/{path}"
+        key = (ladder.lower(), player.lower(), period)
+        ttl = self.cache_ttls.get("player_stats", 0)
+        return await self._player_stats_cache.get_or_fetch(key, ttl, lambda: self.get_json(url, "player_stats", interactive))
 
-    def fetch_player_monthly_stats(self, ladder, player):
-        url = f"{self.host}/api/v1/ladder/{ladder}/player/{player}/month"
-        return self.get_json(url)
+    async def fetch_player_daily_stats(self, ladder, player):
+        return await self.fetch_player_stats(ladder, player, "daily")
 
+    async def fetch_player_monthly_stats(self, ladder, player):
+        return await self.fetch_player_stats(ladder, player, "monthly")
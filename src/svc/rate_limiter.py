@@ -0,0 +1,78 @@
+"""Token-bucket rate limiting for outbound API requests"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimitedError(Exception):
+    """Returned instead of making a request when no token is available within the caller's wait budget"""
+
+    def __init__(self, budget: str, retry_after: float):
+        super().__init__(f"Rate limit budget '{budget}' exhausted, retry in {retry_after:.1f}s")
+        self.budget = budget
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at a steady rate up to a burst capacity.
+
+    Tokens are reserved up front (the balance may go negative), so waiters are
+    served in arrival order and each one knows its wait as soon as it asks.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            name: Budget name, used in errors and logs
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the allowed burst
+        """
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self.rejected = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve one token.
+
+        Args:
+            max_wait: Longest the caller is willing to wait in seconds (None waits as long as needed)
+
+        Returns:
+            Seconds to wait before using the token, or None if that would exceed max_wait (nothing is reserved)
+        """
+        self._refill()
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            self.rejected += 1
+            return None
+        self._tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: Optional[float] = None) -> Optional[RateLimitedError]:
+        """
+        Wait for a token.
+
+        Args:
+            max_wait: Longest to wait in seconds (None waits as long as needed)
+
+        Returns:
+            None once a token is acquired, or a RateLimitedError if it couldn't be within max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return RateLimitedError(self.name, (1 - self._tokens) / self.rate)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return None
@@ -0,0 +1,69 @@
+"""Last known good API responses, kept in memory and mirrored to disk"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.util.json_store import load_json, save_json
+from src.util.logger import MyLogger
+
+logger = MyLogger("SnapshotStore")
+
+
+class SnapshotStore:
+    """
+    Named JSON snapshots with the time they were fetched.
+
+    Every put() is written through to a JSON file, so a restarted bot can
+    serve the last good data immediately, before the API has answered.
+    Writes run in a worker thread, one at a time; puts that arrive while a
+    write is in progress are folded into a single follow-up write.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file the snapshots are persisted to
+        """
+        self.path = path
+        self._snapshots: Dict[str, Dict[str, Any]] = {}  # key -> {"data": ..., "fetched_at": unix_ts}
+        self._write_lock = asyncio.Lock()
+        self._dirty = False
+
+    def load(self) -> None:
+        """Load snapshots from disk, replacing the in-memory entries"""
+        data = load_json(self.path, default={})
+        if not isinstance(data, dict):
+            logger.error(f"Ignoring malformed snapshot store '{self.path}'")
+            data = {}
+        self._snapshots = {
+            key: snapshot for key, snapshot in data.items()
+            if isinstance(snapshot, dict) and "data" in snapshot and "fetched_at" in snapshot
+        }
+        logger.log(f"Loaded {len(self._snapshots)} snapshot(s) from '{self.path}'")
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Return the snapshot stored under key.
+
+        Returns:
+            Tuple of (data, fetched_at unix timestamp), or None if nothing is stored
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        return snapshot["data"], snapshot["fetched_at"]
+
+    async def put(self, key: str, data: Any, fetched_at: Optional[float] = None) -> None:
+        """Store data under key and write the store to disk without blocking the event loop"""
+        self._snapshots[key] = {"data": data, "fetched_at": fetched_at if fetched_at is not None else time.time()}
+        self._dirty = True
+        if self._write_lock.locked():
+            return  # The write in progress writes again once it's done, picking this change up
+
+        async with self._write_lock:
+            while self._dirty:
+                self._dirty = False
+                # Snapshot data is never mutated after put(), so a shallow copy is safe to serialize off the loop
+                await asyncio.to_thread(save_json, self.path, dict(self._snapshots))
@@ -0,0 +1,88 @@
+"""In-memory TTL cache with single-flight request coalescing"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a per-call TTL.
+
+    Concurrent callers asking for the same missing key share a single
+    in-flight fetch instead of each issuing their own request. Values
+    that are exceptions (the API service returns errors as values) are
+    handed to every waiter but never stored.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of stored entries before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, or fetch it once and share the result.
+
+        Args:
+            key: Cache key
+            ttl: Seconds a successful result stays fresh (0 disables storing)
+            fetch: Zero-argument coroutine function producing the value
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._on_fetch_done(key, ttl, t))
+
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    def _on_fetch_done(self, key: Hashable, ttl: float, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        value = task.result()
+        if ttl > 0 and not isinstance(value, Exception):
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a stored entry so the next call fetches fresh data"""
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and coalesce counters along with the current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+        }
@@ -1,8 +1,9 @@
 """
 Periodic cleanup task to remove duplicate messages from bot channels.
 
-This task runs periodically to ensure only one message exists in each bot channel.
-If multiple messages are found, it keeps the most recent one and deletes the rest.
+This task runs periodically to ensure only the live board's pages exist in each bot channel.
+Any other bot messages are deleted. If none of the registered pages exist, the most recent
+message is kept and adopted as the board.
 """
 from discord.ext.commands import Bot
 from src.commands.get_active_matches import last_summary_message_ids
@@ -19,8 +20,8 @@ async def execute(bot: Bot, debug: bool) -> None:
 
     For each configured bot channel:
     1. Fetch all messages
-    2. If more than 1 message exists, keep the most recent and delete the rest
-    3. Update the message cache with the kept message's ID
+    2. Keep the messages registered as board pages and delete the rest
+    3. If no registered page exists, keep the most recent message and register it
 
     Args:
         bot: Discord bot instance
@@ -53,29 +54,27 @@ async def execute(bot: Bot, debug: bool) -> None:
                     messages.append(message)
 
             message_count = len(messages)
+            channel_id = qm_bot_channel.id
+            registered_ids = last_summary_message_ids.get(channel_id)
+            keep_messages = [message for message in messages if message.id in registered_ids]
 
             if message_count == 0:
                 logger.debug(f"No messages in '{server.name}.{qm_bot_channel.name}', skipping cleanup")
                 continue
-            elif message_count == 1:
-                # Update cache with the single message ID
-                channel_id = qm_bot_channel.id
-                if channel_id not in last_summary_message_ids or last_summary_message_ids[channel_id] != messages[0].id:
-                    last_summary_message_ids[channel_id] = messages[0].id
-                    logger.debug(f"Updated cache for '{server.name}.{qm_bot_channel.name}' with message ID {messages[0].id}")
-            else:
-                # Multiple messages found - keep the most recent, delete the rest
-                logger.warning(
-                    f"Found {message_count} messages in '{server.name}.{qm_bot_channel.name}', "
-                    f"cleaning up duplicates..."
-                )
-
-                # Sort by timestamp (most recent first)
+            elif not keep_messages:
+                # None of the registered board pages exist - adopt the most recent message as the board
                 messages.sort(key=lambda m: m.created_at, reverse=True)
+                keep_messages = [messages[0]]
+                last_summary_message_ids[channel_id] = [messages[0].id]
+                logger.debug(f"Updated cache for '{server.name}.{qm_bot_channel.name}' with message ID {messages[0].id}")
 
-                # Keep the first (most recent) message
-                keep_message = messages[0]
-                delete_messages = messages[1:]
+            delete_messages = [message for message in messages if message not in keep_messages]
+            if delete_messages:
+                # Messages that aren't part of the board are duplicates - keep the board pages, delete the rest
+                logger.warning(
+                    f"Found {message_count} messages in '{server.name}.{qm_bot_channel.name}' "
+                    f"({len(keep_messages)} board page(s)), cleaning up duplicates..."
+                )
 
                 # Delete old messages
                 deleted_count = 0
@@ -87,13 +86,10 @@ async def execute(bot: Bot, debug: bool) -> None:
                     except Exception as e:
                         logger.error(f"Failed to delete message {message.id}: {e}")
 
-                # Update cache with the kept message
-                channel_id = qm_bot_channel.id
-                last_summary_message_ids[channel_id] = keep_message.id
-
+                kept_ids = ", ".join(str(message.id) for message in keep_messages)
                 success_msg = (
                     f"Cleaned up {deleted_count} duplicate message(s) in "
-                    f"'{server.name}.{qm_bot_channel.name}', kept message {keep_message.id}"
+                    f"'{server.name}.{qm_bot_channel.name}', kept message(s) {kept_ids}"
                 )
                 logger.log(success_msg)
                 await send_message_to_log_channel(bot=bot, msg=success_msg)
@@ -0,0 +1,32 @@
+from src.svc.candle_history import CandleHistoryStore, utc_today
+from src.svc.cncnet_api_svc import CnCNetApiSvc
+from src.util.logger import MyLogger
+from src.util.utils import is_error
+
+logger = MyLogger("record_candle_history_task")
+
+
+async def execute(cnc_api_client: CnCNetApiSvc, candle_history: CandleHistoryStore, tracked_days: int, max_players: int):
+    """
+    Record the day's final stats for every player looked up recently, so their multi-day candles
+    have a complete value for each day even when nobody asks for them. Runs just before the UTC
+    day rolls over; lookups during the day record the player themselves.
+    """
+    day = utc_today()
+    players = await candle_history.tracked_players(max_age_days=tracked_days, limit=max_players)
+    recorded = 0
+    for ladder, player in players:
+        # Background budget: this task waits for tokens instead of competing with commands
+        stats = await cnc_api_client.fetch_player_stats(ladder, player, "daily", interactive=False)
+        if utc_today() != day:
+            # Daily stats have reset, anything fetched from here on belongs to the new day
+            logger.warning(f"UTC day rolled over during the candle history sweep, stopping at {recorded}/{len(players)}")
+            break
+        if is_error(stats) or "error" in stats:
+            logger.debug(f"Skipping candle history for {player} on {ladder}: {stats}")
+            continue
+        await candle_history.record_day(ladder, player, stats, day=day)
+        recorded += 1
+
+    await candle_history.prune(tracked_max_age_days=tracked_days)
+    logger.debug(f"Recorded candle history for {recorded}/{len(players)} tracked player(s)")
@@ -1,142 +1,201 @@
-import os
+from typing import Dict, Set
 
-from discord.utils import get
+import discord
 
+from src.util.guild_index import AMBIGUOUS, FOUND, GuildIndex
+from src.util.identity_cache import IdentityCache
+from src.util.qm_role_table import QM_ROLE_TABLES, QMRoleTable
 from src.util.utils import is_error, get_exception_msg, send_file_to_channel
 from src.util.logger import MyLogger
 from src.svc.cncnet_api_svc import CnCNetApiSvc
-from src.constants.constants import YR_DISCORD_ID
+from src.constants.constants import IDENTITY_CACHE_PATH
 
 logger = MyLogger("SyncQMRankingRoles")
 
+# Ranked player -> Discord user ID, so members keep their roles when they rename themselves
+identity_cache = IdentityCache(IDENTITY_CACHE_PATH)
 
-# Patterns for QM roles to remove
-QM_ROLE_PATTERNS = [
-    "ra2 qm", "yr qm", "blitz-2v2 qm", "ra2-2v2 qm"
-]
-
-
-# Helper to determine the correct role name for a given ladder and rank
-def get_role_name(ladder, rank):
-    if rank == 1:
-        return f"{ladder} QM Rank 1"
-    elif rank <= 3:
-        return f"{ladder} QM Top 3"
-    elif rank <= 5:
-        return f"{ladder} QM Top 5"
-    elif rank <= 10:
-        return f"{ladder} QM Top 10"
-    elif rank <= 25:
-        return f"{ladder} QM Top 25"
-    elif rank <= 50:
-        return f"{ladder} QM Top 50"
-    return None
 
 async def execute(bot, cnc_api_client):
 
     logger.debug("Starting update_qm_roles")
 
-    # Remove all QM roles from members before assigning new ones
-    await remove_qm_roles(bot=bot)
-
-    # Assign new QM roles based on current rankings
-    await assign_qm_role(bot=bot, cnc_api_client=cnc_api_client)
-
-    logger.debug("completed updating QM roles")
-
-
-async def remove_qm_roles(bot):
-    logger.debug("Removing QM roles")
-    guilds = bot.guilds
+    # Fetch QM player ranks once, before touching any roles, so an API failure leaves everyone's roles as they are
+    rankings_json = await cnc_api_client.fetch_rankings()
+    if is_error(rankings_json):
+        logger.log(f"No ranking results found, exiting sync. {get_exception_msg(rankings_json)}")
+        return
 
-    for server in guilds:
-        if server.id != YR_DISCORD_ID:  # Only process YR discord
+    identity_cache.load()
+    for server in bot.guilds:
+        role_table = QM_ROLE_TABLES.get(server.id)
+        if role_table is None:  # Only guilds with "qm_role_ladders" configured
             continue
 
-        for member in server.members:
-            for role in member.roles:
+        missing_roles = role_table.bind(server)
+        if missing_roles:
+            logger.warning(f"QM roles missing in '{server.name}', run create_qm_roles: {', '.join(missing_roles)}")
 
-                # Don't remove champion roles
-                if 'champion' in role.name.lower():
-                    continue
-
-                # Remove any QM role matching the patterns
-                if any(pattern in role.name.lower() for pattern in QM_ROLE_PATTERNS):
-                    await member.remove_roles(role)
+        desired_roles = await compute_desired_qm_roles(
+            bot=bot, server=server, rankings_json=rankings_json, role_table=role_table
+        )
+        await apply_qm_role_changes(bot=bot, server=server, desired_roles=desired_roles, role_table=role_table)
+    identity_cache.save()
 
-    logger.debug("Finished removing QM roles")
+    logger.debug("completed updating QM roles")
 
 
-async def assign_qm_role(bot, cnc_api_client: CnCNetApiSvc):
-    logger.debug("Assigning QM Roles")
-    guilds = bot.guilds
+def resolve_member(server, index: GuildIndex, ladder, player_name, discord_name):
+    """
+    Find the member behind a ranked player: by the user ID cached from an earlier sync if the ladder
+    still reports the same discord_name, otherwise by name. Unambiguous name matches refresh the cache.
+
+    Returns:
+        Tuple of (member or None, FOUND / MISSING / AMBIGUOUS)
+    """
+    user_id = identity_cache.get_user_id(ladder, player_name, discord_name)
+    if user_id is not None:
+        member = server.get_member(user_id)
+        if member is not None:
+            return member, FOUND
+
+    member, status = index.find_member(discord_name)
+    if status == FOUND:
+        identity_cache.put(ladder, player_name, member.id, discord_name)
+    return member, status
+
+
+async def compute_desired_qm_roles(bot, server, rankings_json, role_table: QMRoleTable) -> Dict[int, Set]:
+    """
+    Work out which QM roles each ranked member should have.
+
+    Returns:
+        Dict of member ID -> set of QM role objects; members not in it should have no QM role
+    """
+    logger.debug("Computing QM roles")
+    desired_roles: Dict[int, Set] = {}
+
+    # Index members once per sync, every lookup below is then a dict access
+    index = GuildIndex(server)
+    missing_members = []
+    ambiguous_members = []
+
+    for ladder in role_table.ladders:
+        rank = 0
+        ladder_assignments = []  # Collect action messages for this ladder
+        if ladder not in rankings_json:
+            available_keys = list(rankings_json.keys())
+            logger.warning(
+                f"[LADDER ASSIGNMENT WARNING] Requested ladder '{ladder}' not found in rankings_json. "
+                f"This may indicate a data issue or a misconfiguration. "
+                f"Available ladders: {available_keys}"
+            )
+            ladder_assignments.append(f"Ladder '{ladder}' not found in rankings_json.")
+        else:
+            for item in rankings_json[ladder][:role_table.max_rank]:  # Only ranks that have a role
+                rank += 1
+                discord_name = item["discord_name"]
+                player_name = item["player_name"]
+
+                # Skip if no discord name for player
+                if not discord_name:
+                    msg = f"#{rank}: No discord name found for player '{player_name}'"
+                    ladder_assignments.append(msg)
+                    logger.debug(msg)
+                    continue
 
-    # Fetch QM player ranks once
-    rankings_json = cnc_api_client.fetch_rankings()
-    if is_error(rankings_json):
-        logger.log(f"No ranking results found, exiting assign_qm_role(). {get_exception_msg(rankings_json)}")
-        return
+                # Find the Discord member by name
+                member, status = resolve_member(server, index, ladder, player_name, discord_name)
+                if status == AMBIGUOUS:
+                    msg = f"#{rank}: Several users match name '{discord_name}' for player '{player_name}' in server {server}"
+                    ladder_assignments.append(msg)
+                    ambiguous_members.append(f"{ladder} #{rank} {player_name} -> '{discord_name}'")
+                    logger.debug(msg)
+                    continue
+                if not member:
+                    msg = f"#{rank}: No user found with name '{discord_name}' for player '{player_name}' in server {server}"
+                    ladder_assignments.append(msg)
+                    missing_members.append(f"{ladder} #{rank} {player_name} -> '{discord_name}'")
+                    logger.debug(msg)
+                    continue
 
-    for server in guilds:
-        if server.id != YR_DISCORD_ID:  # Only process YR discord
-            continue
+                # Determine the correct role name
+                role_name = role_table.role_name_for(ladder, rank)
+                if not role_name:
+                    msg = f"#{rank}: No valid role found for ladder '{ladder}'"
+                    ladder_assignments.append(msg)
+                    logger.debug(msg)
+                    continue
 
-        ladder_abbrev_arr = ["RA2", "YR", "BLITZ-2V2", "RA2-2V2"]
-        for ladder in ladder_abbrev_arr:
-            rank = 0
-            ladder_assignments = []  # Collect action messages for this ladder
-            if ladder not in rankings_json:
-                available_keys = list(rankings_json.keys())
-                logger.warning(
-                    f"[LADDER ASSIGNMENT WARNING] Requested ladder '{ladder}' not found in rankings_json. "
-                    f"This may indicate a data issue or a misconfiguration. "
-                    f"Available ladders: {available_keys}"
-                )
-                ladder_assignments.append(f"Ladder '{ladder}' not found in rankings_json.")
-            else:
-                for item in rankings_json[ladder][:50]:  # Only process top 50
-                    rank += 1
-                    discord_name = item["discord_name"]
-                    player_name = item["player_name"]
-
-                    # Skip if no discord name for player
-                    if not discord_name:
-                        msg = f"#{rank}: No discord name found for player '{player_name}'"
-                        ladder_assignments.append(msg)
-                        logger.debug(msg)
-                        continue
-
-                    # Find the Discord member by name
-                    member = server.get_member_named(discord_name)
-                    if not member:
-                        msg = f"#{rank}: No user found with name '{discord_name}' for player '{player_name}' in server {server}"
-                        ladder_assignments.append(msg)
-                        logger.debug(msg)
-                        continue
-
-                    # Determine the correct role name
-                    role_name = get_role_name(ladder, rank)
-                    if not role_name:
-                        msg = f"#{rank}: No valid role found for ladder '{ladder}'"
-                        ladder_assignments.append(msg)
-                        logger.debug(msg)
-                        continue
-
-                    # Find the role object in the server
-                    role = get(server.roles, name=role_name)
-                    if not role:
-                        msg = f"#{rank}: No valid role found for role_name '{role_name}'"
-                        ladder_assignments.append(msg)
-                        logger.debug(msg)
-                        continue
-
-                    # Assign the role to the member
-                    msg = f"#{rank}: Assigned role '{role_name}' to user '{discord_name}' (player '{player_name}')"
+                # Find the role object in the server
+                role = role_table.role_for(ladder, rank)
+                if not role:
+                    msg = f"#{rank}: No valid role found for role_name '{role_name}'"
                     ladder_assignments.append(msg)
                     logger.debug(msg)
-                    await member.add_roles(role)
+                    continue
+
+                msg = f"#{rank}: Role '{role_name}' for user '{discord_name}' (player '{player_name}')"
+                ladder_assignments.append(msg)
+                logger.debug(msg)
+                desired_roles.setdefault(member.id, set()).add(role)
+
+        # Send a summary of actions taken for this ladder to the log channel
+        if ladder_assignments:
+            await send_file_to_channel(bot=bot, filename=f"Ladder {ladder}: role updates log.txt", content="\n".join(ladder_assignments))
+
+    # Bulk report of ranked players that couldn't be matched to exactly one member
+    unresolved = []
+    if ambiguous_members:
+        unresolved += [f"Ambiguous ({len(ambiguous_members)}):"] + ambiguous_members + [""]
+    if missing_members:
+        unresolved += [f"Missing ({len(missing_members)}):"] + missing_members + [""]
+    duplicate_roles = index.duplicate_role_names()
+    if duplicate_roles:
+        unresolved += [f"Duplicate role names ({len(duplicate_roles)}):"] + duplicate_roles
+    if unresolved:
+        logger.log(
+            f"QM role sync for '{server.name}': {len(ambiguous_members)} ambiguous, "
+            f"{len(missing_members)} missing member(s)"
+        )
+        await send_file_to_channel(bot=bot, filename="QM role sync unresolved players.txt", content="\n".join(unresolved))
+
+    return desired_roles
+
+
+async def apply_qm_role_changes(bot, server, desired_roles: Dict[int, Set], role_table: QMRoleTable) -> None:
+    """
+    Bring every member's QM roles in line with desired_roles.
+    Members whose QM roles already match are not touched; each changed member gets a single roles update.
+    """
+    logger.debug("Applying QM role changes")
+    changes = []
+    failures = []
+    unchanged = 0
+    managed_role_ids = role_table.managed_role_ids()  # Champion and other roles are never touched
+
+    for member in server.members:
+        current = {role for role in member.roles if role.id in managed_role_ids}
+        desired = desired_roles.get(member.id, set())
+        if current == desired:
+            unchanged += 1
+            continue
 
-            # Send a summary of actions taken for this ladder to the log channel
-            if ladder_assignments:
-                await send_file_to_channel(bot=bot, filename=f"Ladder {ladder}: role updates log.txt", content="\n".join(ladder_assignments))
-    logger.debug("Completed assigning QM Roles")
+        # member.roles[0] is @everyone, which can't be set explicitly
+        new_roles = [role for role in member.roles[1:] if role not in current] + sorted(desired, key=lambda r: r.id)
+        added = ", ".join(sorted(role.name for role in desired - current)) or "-"
+        removed = ", ".join(sorted(role.name for role in current - desired)) or "-"
+        try:
+            await member.edit(roles=new_roles, reason="QM ranking role sync")
+            changes.append(f"{member}: +[{added}] -[{removed}]")
+        except discord.HTTPException as e:
+            failures.append(f"{member}: +[{added}] -[{removed}] failed: {e}")
+            logger.error(f"Failed to update QM roles for {member}: {e}")
+
+    summary = f"QM role sync for '{server.name}': {len(changes)} member(s) updated, {unchanged} unchanged, {len(failures)} failed"
+    logger.log(summary)
+    await send_file_to_channel(
+        bot=bot,
+        filename="QM role sync changes.txt",
+        content="\n".join([summary, ""] + changes + failures)
+    )
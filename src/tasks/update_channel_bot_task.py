@@ -1,3 +1,4 @@
+import time
 import discord
 from discord import DiscordServerError
 from src.commands.get_active_matches import fetch_active_qms
@@ -6,7 +7,7 @@ from src.svc.cncnet_api_svc import CnCNetApiSvc
 from src.util.logger import MyLogger
 from src.util.utils import send_message_to_log_channel, get_exception_msg, is_error
 
-async def handle_api_error(bot, error_json, error_type, error_count, debug, stats_json=None):
+async def report_api_error(bot, error_json, error_type, error_count):
     if error_type == "stats":
         api_name = "/stats/all"
     else:
@@ -18,6 +19,11 @@ async def handle_api_error(bot, error_json, error_type, error_count, debug, stat
     if error_count == 10:
         await send_message_to_log_channel(bot=bot,
                                           msg=f"<@{BURG_ID}> {error_type} API has failed {error_count} times in a row!")
+    return error_count
+
+
+async def handle_api_error(bot, error_json, error_type, error_count, debug, stats_json=None):
+    error_count = await report_api_error(bot, error_json, error_type, error_count)
     # Update bot channel message with error
     if error_type == "stats":
         await fetch_active_qms(
@@ -44,7 +50,39 @@ total_count = 0
 _ladder_refresh_attempted = False  # Track if we've already tried to refresh this session
 
 
-async def execute(bot, ladders: list, cnc_api_client: CnCNetApiSvc, debug, bot_state=None) -> dict:
+async def serve_stale_snapshot(bot, snapshot, cnc_api_client: CnCNetApiSvc, debug, max_stale_seconds) -> bool:
+    """
+    Keep the bot channel on the last good data while the API is failing, marked with the time
+    the data was fetched. Only the failed part comes from the last good snapshot, whichever of
+    stats and active matches succeeded this tick is shown fresh.
+
+    Returns:
+        bool: True if a stale snapshot young enough to show was rendered, False otherwise
+    """
+    global error_count
+
+    stale = cnc_api_client.cached_live_snapshot("all", max_age=max_stale_seconds)
+    if stale is None:
+        return False
+
+    if not snapshot.stats_ok:
+        error_count = await report_api_error(bot, snapshot.stats_json, "stats", error_count)
+    else:
+        error_count = await report_api_error(bot, snapshot.active_matches_json, "active matches", error_count)
+
+    logger.log(f"Serving live data as of {int(time.time() - stale.as_of)}s ago while the API is failing")
+    await fetch_active_qms(
+        bot=bot,
+        stats_json=snapshot.stats_json if snapshot.stats_ok else stale.stats_json,
+        active_matches_json=snapshot.active_matches_json if snapshot.active_matches_ok else stale.active_matches_json,
+        debug=debug,
+        stats_as_of=None if snapshot.stats_ok else stale.as_of,
+        matches_as_of=None if snapshot.active_matches_ok else stale.as_of
+    )
+    return True
+
+
+async def execute(bot, ladders: list, cnc_api_client: CnCNetApiSvc, debug, bot_state=None, max_stale_seconds=0) -> dict:
     logger.debug("Starting update_channel_bot_task()...")
     global error_count, _ladder_refresh_attempted
 
@@ -73,18 +111,24 @@ async def execute(bot, ladders: list, cnc_api_client: CnCNetApiSvc, debug, bot_s
                 await send_message_to_log_channel(bot=bot, msg=msg)
                 return {"error": "Failed to fetch stats", "status": "failed"}
 
-        stats_json = cnc_api_client.fetch_stats("all")
-        if is_error(stats_json):
-            error_count = await handle_api_error(bot, stats_json, "stats", error_count, debug)
+        # Fetch stats and active matches concurrently, then handle failures in the same order as before
+        snapshot = await cnc_api_client.fetch_live_snapshot("all")
+        if not (snapshot.stats_ok and snapshot.active_matches_ok) and await serve_stale_snapshot(
+            bot, snapshot, cnc_api_client, debug, max_stale_seconds
+        ):
+            # Still an error so the task backs off to its error interval and polls (revalidates) less often
+            return {"error": "Serving stale live data", "status": "stale"}
+
+        if not snapshot.stats_ok:
+            error_count = await handle_api_error(bot, snapshot.stats_json, "stats", error_count, debug)
             return {"error": "Failed to fetch stats", "status": "failed"}
         else:
             error_count = 0
 
-        active_matches_json = cnc_api_client.active_matches(ladder="all")
-        if is_error(active_matches_json):
-            error_count = await handle_api_error(bot, active_matches_json, "active matches", error_count, debug, stats_json=stats_json)
+        if not snapshot.active_matches_ok:
+            error_count = await handle_api_error(bot, snapshot.active_matches_json, "active matches", error_count, debug, stats_json=snapshot.stats_json)
             return {"error": "Failed to fetch stats"}
-        await fetch_active_qms(bot=bot, stats_json=stats_json, active_matches_json=active_matches_json, debug=debug)
+        await fetch_active_qms(bot=bot, stats_json=snapshot.stats_json, active_matches_json=snapshot.active_matches_json, debug=debug)
 
         return {"error": None, "status": "success"}
     except (DiscordServerError, KeyError, Exception) as e:
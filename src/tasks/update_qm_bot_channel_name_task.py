@@ -55,6 +55,6 @@ async def update_qm_bot_channel_name_task(bot, stats_json, active_matches):
 
 async def periodic_update_qm_bot_channel_name(bot, cnc_api_client):
     while True:
-        stats_json = cnc_api_client.fetch_stats("all")
-        active_matches_json = cnc_api_client.active_matches(ladder="all")
+        stats_json = await cnc_api_client.fetch_stats("all")
+        active_matches_json = await cnc_api_client.active_matches(ladder="all")
         await update_qm_bot_channel_name_task(bot, stats_json, active_matches_json)
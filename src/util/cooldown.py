@@ -0,0 +1,57 @@
+"""Bounded, self-expiring per-user cooldowns"""
+import time
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+
+class CooldownTracker:
+    """
+    Remembers when each key (e.g. user + button) was last used, for one fixed cooldown.
+
+    Entries are kept in last-used order, so expired ones are always at the front
+    and are dropped as new ones come in. Memory stays bounded by max_entries no
+    matter how many users or messages are involved.
+    """
+
+    def __init__(self, cooldown_seconds: float, max_entries: int = 10000):
+        """
+        Initialize the tracker.
+
+        Args:
+            cooldown_seconds: Seconds a key stays on cooldown after use
+            max_entries: Maximum number of tracked keys, the oldest are dropped first
+        """
+        self.cooldown_seconds = cooldown_seconds
+        self.max_entries = max_entries
+        self._last_used: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._last_used:
+            key, used_at = next(iter(self._last_used.items()))
+            if now - used_at < self.cooldown_seconds and len(self._last_used) <= self.max_entries:
+                break
+            del self._last_used[key]
+
+    def check(self, key: Hashable) -> Tuple[bool, float]:
+        """
+        Check whether key is on cooldown.
+
+        Returns:
+            Tuple of (is_on_cooldown: bool, remaining_seconds: float)
+        """
+        now = time.monotonic()
+        self._expire(now)
+        used_at = self._last_used.get(key)
+        if used_at is None:
+            return False, 0.0
+        return True, self.cooldown_seconds - (now - used_at)
+
+    def touch(self, key: Hashable) -> None:
+        """Start the cooldown for key"""
+        now = time.monotonic()
+        self._last_used[key] = now
+        self._last_used.move_to_end(key)
+        self._expire(now)
+
+    def __len__(self) -> int:
+        return len(self._last_used)
@@ -1,3 +1,8 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 import discord
 
 player_color_to_emoji = {
@@ -30,11 +35,86 @@ game_color = {
 }
 
 
-def _create_base_embed(ladder_abbrev: str, match_data: dict) -> discord.Embed:
+# Rendered match embeds and the last reported duration in seconds, keyed by match fingerprint (most recently used last)
+MATCH_EMBED_CACHE_SIZE = 200
+_match_embed_cache: "OrderedDict[Tuple, Tuple[discord.Embed, Optional[int]]]" = OrderedDict()
+
+
+def match_fingerprint(ladder_abbrev: str, match_data: dict) -> Tuple:
+    """
+    Build a stable identity for a match from the fields that don't change while it's being played.
+    The API's match ID is included when the payload has one. Without it, an immediate rematch with
+    the same setup has the same fingerprint, which create_embeds detects by the duration going down.
+    """
+    players = tuple(sorted(
+        (
+            str(player.get('playerName')),
+            str(player.get('playerFaction')),
+            str(player.get('playerColor')),
+            str(player.get('teamId', player.get('playerTeam'))),
+            str(player.get('twitchProfile')),
+            bool(player.get('twitchLiveAtStart', False)),
+        )
+        for player in match_data['players']
+    ))
+    return ladder_abbrev.lower(), match_data.get('id'), match_data.get('mapName'), match_data.get('mapUrl'), players
+
+
+def evict_finished_match_embeds(active_matches_json: dict) -> None:
+    """Drop cached embeds for matches that are no longer listed in /active_matches."""
+    active_fingerprints = {
+        match_fingerprint(ladder_abbrev, match)
+        for ladder_abbrev, matches in active_matches_json.items()
+        for match in matches
+    }
+    for fingerprint in list(_match_embed_cache):
+        if fingerprint not in active_fingerprints:
+            del _match_embed_cache[fingerprint]
+
+
+DURATION_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+
+def parse_game_duration(game_duration) -> Optional[int]:
+    """
+    Parse the API's gameDuration string ("4 mins 3 sec", "1 hour 2 mins", "5:23") into seconds.
+    Returns None if the format isn't recognised.
+    """
+    if not isinstance(game_duration, str):
+        return None
+
+    text = game_duration.strip().lower()
+    if re.fullmatch(r"\d+(:\d{1,2}){1,2}", text):
+        seconds = 0
+        for part in text.split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+
+    units = re.findall(r"(\d+)\s*([hms])[a-z]*", text)
+    if not units:
+        return None
+    return sum(int(value) * DURATION_UNIT_SECONDS[unit] for value, unit in units)
+
+
+def _describe_match(match_data: dict, fetched_at: Optional[float] = None) -> str:
+    """
+    Map name plus the match start as a Discord relative timestamp, which the client keeps current on its own.
+    The start is the reported duration back from fetched_at, the time the match data was fetched (now by default).
+    Falls back to the raw duration string if it can't be parsed.
+    """
+    duration_seconds = parse_game_duration(match_data['gameDuration'])
+    if duration_seconds is None:
+        return f"{match_data['mapName']}\n{match_data['gameDuration']}"
+
+    started_at = int(fetched_at if fetched_at is not None else time.time()) - duration_seconds
+    return f"{match_data['mapName']}\nStarted <t:{started_at}:R>"
+
+
+def _create_base_embed(ladder_abbrev: str, match_data: dict, fetched_at: Optional[float] = None) -> discord.Embed:
     """Create the base embed with title, description, and thumbnail."""
     embed = discord.Embed(
         title=ladder_abbrev.upper(),
-        description=f"{match_data['mapName']}\n{match_data['gameDuration']}",
+        description=_describe_match(match_data, fetched_at),
         color=game_color.get(ladder_abbrev.lower(), discord.Color.light_gray())
     )
     embed.set_thumbnail(url=match_data["mapUrl"])
@@ -73,19 +153,49 @@ def _format_player_string(player: dict, is_observer: bool) -> str:
             return f"{color_emoji} {player_name} ({faction})"
 
 
-def create_embeds(ladder_abbrev: str, match_data: list) -> list:
+def create_embeds(
+    ladder_abbrev: str,
+    match_data: list,
+    limit: Optional[int] = None,
+    fetched_at: Optional[float] = None
+) -> list:
+    """
+    Build one embed per active match. Matches are no longer capped at Discord's 10-embeds-per-message
+    limit here, the live board splits them across as many messages as needed.
+    fetched_at is when match_data was fetched, so matches served from a stale snapshot get the right start time.
+    """
     embeds = []
 
     for match in match_data:
-        if match['ladderType'] == "1vs1":
-            embed = create_1v1_match_embed(ladder_abbrev=ladder_abbrev, match_data=match)
-        elif match['ladderType'] == "2vs2":
-            embed = create_team_match_embed(ladder_abbrev=ladder_abbrev, match_data=match)
+        fingerprint = match_fingerprint(ladder_abbrev, match)
+        duration_seconds = parse_game_duration(match['gameDuration'])
+        embed, last_duration = _match_embed_cache.get(fingerprint, (None, None))
+        if embed is not None and duration_seconds is not None and last_duration is not None \
+                and duration_seconds < last_duration:
+            embed = None  # Duration went down: a rematch with the same setup, not the cached game
+
+        if embed is not None:
+            # Players, factions, colors, map and start time never change mid-match.
+            # Only a duration we couldn't turn into a start timestamp needs patching.
+            _match_embed_cache[fingerprint] = (embed, duration_seconds)
+            _match_embed_cache.move_to_end(fingerprint)
+            if duration_seconds is None:
+                embed.description = _describe_match(match, fetched_at)
         else:
-            raise ValueError(f"Unexpected ladderType: {match['ladderType']}")  # More specific exception
+            if match['ladderType'] == "1vs1":
+                embed = create_1v1_match_embed(ladder_abbrev=ladder_abbrev, match_data=match, fetched_at=fetched_at)
+            elif match['ladderType'] == "2vs2":
+                embed = create_team_match_embed(ladder_abbrev=ladder_abbrev, match_data=match, fetched_at=fetched_at)
+            else:
+                raise ValueError(f"Unexpected ladderType: {match['ladderType']}")  # More specific exception
+
+            _match_embed_cache[fingerprint] = (embed, duration_seconds)
+            _match_embed_cache.move_to_end(fingerprint)
+            if len(_match_embed_cache) > MATCH_EMBED_CACHE_SIZE:
+                _match_embed_cache.popitem(last=False)
         embeds.append(embed)
 
-        if len(embeds) >= 10:
+        if limit is not None and len(embeds) >= limit:
             break
 
     return embeds
@@ -111,8 +221,18 @@ def get_player_color_from_index(color_index: int):
     raise ValueError(f"Unexpected color index: {str(color_index)}")
 
 
-def create_team_match_embed(ladder_abbrev: str, match_data: dict) -> discord.Embed:
-    embed = _create_base_embed(ladder_abbrev, match_data)
+def is_observer(player: dict) -> bool:
+    """Detect a 1v1 observer by team field or faction."""
+    return player.get('playerTeam') == 'observer' or player.get('playerFaction') == 'Observer'
+
+
+def is_observer_team(team_id) -> bool:
+    """Detect the observer group of a team match by its team ID."""
+    return not team_id or str(team_id) == "observer"
+
+
+def create_team_match_embed(ladder_abbrev: str, match_data: dict, fetched_at: Optional[float] = None) -> discord.Embed:
+    embed = _create_base_embed(ladder_abbrev, match_data, fetched_at)
 
     # Group players by team
     teams = {}
@@ -124,14 +244,14 @@ def create_team_match_embed(ladder_abbrev: str, match_data: dict) -> discord.Emb
 
     # Add a field for each team
     for team_id, players in teams.items():
-        is_observer = not team_id or str(team_id) == "observer"
+        observer_team = is_observer_team(team_id)
 
         player_list = []
         for player in players:
-            player_string = _format_player_string(player, is_observer)
+            player_string = _format_player_string(player, observer_team)
             player_list.append(player_string)
 
-        team_name = "Observer" if is_observer else f"Team {team_id}"
+        team_name = "Observer" if observer_team else f"Team {team_id}"
 
         embed.add_field(
             name=team_name,
@@ -142,19 +262,15 @@ def create_team_match_embed(ladder_abbrev: str, match_data: dict) -> discord.Emb
     return embed
 
 
-def create_1v1_match_embed(ladder_abbrev: str, match_data: dict) -> discord.Embed:
-    embed = _create_base_embed(ladder_abbrev, match_data)
+def create_1v1_match_embed(ladder_abbrev: str, match_data: dict, fetched_at: Optional[float] = None) -> discord.Embed:
+    embed = _create_base_embed(ladder_abbrev, match_data, fetched_at)
 
     # Separate observers from regular players
     observers = []
     players = []
 
     for player in match_data['players']:
-        player_team = player.get('playerTeam')
-        player_faction = player.get('playerFaction')
-
-        # Detect observer by team field or faction
-        if player_team == 'observer' or player_faction == 'Observer':
+        if is_observer(player):
             observers.append(player)
         else:
             players.append(player)
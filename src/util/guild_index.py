@@ -0,0 +1,111 @@
+"""Per-run lookup index of a guild's members and roles"""
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+FOUND = "found"
+MISSING = "missing"
+AMBIGUOUS = "ambiguous"
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a Discord name"""
+    return (name or "").strip().casefold()
+
+
+def split_discriminator(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a "name#1234" tag (or the "name#0" of a migrated username) into (name, discriminator).
+    Names without a valid discriminator are returned whole, with None.
+    """
+    username, _, discriminator = name.rpartition("#")
+    if username and (discriminator == "0" or (len(discriminator) == 4 and discriminator.isdigit())):
+        return username, discriminator
+    return name, None
+
+
+class GuildIndex:
+    """
+    Members and roles of one guild, indexed once so each lookup is a dict access.
+
+    Like Guild.get_member_named, a "name#1234" tag only matches that exact tag and
+    "name#0" only matches the migrated username; anything else is matched against
+    username, then global display name, then server nickname. Unlike it, names are
+    also matched case-insensitively, with an exact-case match preferred, and a name
+    shared by several members at the first tier that has any match is reported as
+    ambiguous instead of picking one arbitrarily.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        """
+        Build the index.
+
+        Args:
+            guild: Guild whose cached members and roles are indexed
+        """
+        self.guild = guild
+        # Per tier: normalized name -> [(name as written, member)]
+        self._tiers: List[Dict[str, List[Tuple[str, discord.Member]]]] = [{}, {}, {}, {}]  # tag, username, global name, nick
+        self._roles_by_name: Dict[str, List[discord.Role]] = {}
+
+        for member in guild.members:
+            discriminator = getattr(member, "discriminator", "0")
+            names = (
+                f"{member.name}#{discriminator}" if discriminator not in ("0", "", None) else None,
+                member.name,
+                getattr(member, "global_name", None),
+                member.nick,
+            )
+            for tier, name in zip(self._tiers, names):
+                key = normalize_name(name)
+                if key:
+                    tier.setdefault(key, []).append((name.strip(), member))
+
+        for role in guild.roles:
+            self._roles_by_name.setdefault(normalize_name(role.name), []).append(role)
+
+    @staticmethod
+    def _match_tier(
+        tier: Dict[str, List[Tuple[str, discord.Member]]],
+        query: str
+    ) -> Tuple[Optional[discord.Member], Optional[str]]:
+        """Match query within one tier, preferring exact-case matches. Status is None when nothing matched."""
+        entries = tier.get(normalize_name(query))
+        if not entries:
+            return None, None
+
+        exact = {member.id: member for name, member in entries if name == query}
+        matches = exact or {member.id: member for _, member in entries}
+        if len(matches) > 1:
+            return None, AMBIGUOUS
+        return next(iter(matches.values())), FOUND
+
+    def find_member(self, discord_name: str) -> Tuple[Optional[discord.Member], str]:
+        """
+        Resolve a name as entered on the ladder to a guild member.
+
+        Returns:
+            Tuple of (member or None, FOUND / MISSING / AMBIGUOUS)
+        """
+        query = (discord_name or "").strip()
+        if not query:
+            return None, MISSING
+
+        tag, username, global_name, nick = self._tiers
+        name, discriminator = split_discriminator(query)
+        if discriminator == "0":
+            candidates = [(username, name)]
+        elif discriminator is not None:
+            candidates = [(tag, query)]
+        else:
+            candidates = [(username, query), (global_name, query), (nick, query)]
+
+        for tier, key in candidates:
+            member, status = self._match_tier(tier, key)
+            if status is not None:
+                return member, status
+        return None, MISSING
+
+    def duplicate_role_names(self) -> List[str]:
+        """Role names used by more than one role, which makes name lookups ambiguous"""
+        return [roles[0].name for roles in self._roles_by_name.values() if len(roles) > 1]
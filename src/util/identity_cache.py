@@ -0,0 +1,74 @@
+"""Persistent mapping of ranked ladder players to their Discord user IDs"""
+from typing import Dict, Optional
+
+from src.util.guild_index import normalize_name
+from src.util.json_store import load_json, save_json
+from src.util.logger import MyLogger
+
+logger = MyLogger("identity_cache")
+
+
+class IdentityCache:
+    """
+    Maps (ladder, player name) -> {"user_id", "discord_name"}, mirrored to a JSON file.
+
+    An entry records which member the player's ladder-side discord_name resolved to.
+    It stays valid for as long as the ladder keeps reporting the same discord_name,
+    so the member can rename themselves on Discord without losing their ranked role.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file the cache is persisted to
+        """
+        self.path = path
+        self._identities: Dict[str, Dict] = {}
+        self._dirty = False
+
+    @staticmethod
+    def _key(ladder: str, player_name: str) -> str:
+        return f"{ladder.lower()}:{player_name.lower()}"
+
+    def load(self) -> None:
+        """Load the cache from disk, replacing the in-memory entries"""
+        data = load_json(self.path, default={})
+        if not isinstance(data, dict):
+            logger.error(f"Ignoring malformed identity cache '{self.path}'")
+            data = {}
+        self._identities = {
+            key: entry for key, entry in data.items()
+            if isinstance(entry, dict) and isinstance(entry.get("user_id"), int) and "discord_name" in entry
+        }
+        self._dirty = False
+        logger.debug(f"Loaded {len(self._identities)} player identities from '{self.path}'")
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed since the last load or save"""
+        if self._dirty and save_json(self.path, self._identities):
+            self._dirty = False
+
+    def get_user_id(self, ladder: str, player_name: str, discord_name: str) -> Optional[int]:
+        """
+        Return the cached user ID for the player, if it was resolved from the same discord_name.
+
+        Returns:
+            Discord user ID, or None if unknown or the ladder now reports a different discord_name
+        """
+        entry = self._identities.get(self._key(ladder, player_name))
+        if entry is None or normalize_name(entry["discord_name"]) != normalize_name(discord_name):
+            return None
+        return entry["user_id"]
+
+    def put(self, ladder: str, player_name: str, user_id: int, discord_name: str) -> None:
+        """Record that the player's discord_name resolved unambiguously to user_id"""
+        key = self._key(ladder, player_name)
+        entry = {"user_id": user_id, "discord_name": discord_name}
+        if self._identities.get(key) != entry:
+            self._identities[key] = entry
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._identities)
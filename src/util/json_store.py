@@ -0,0 +1,53 @@
+"""Small helpers for persisting bot state as JSON files on disk"""
+import json
+import os
+from typing import Any
+
+from src.util.logger import MyLogger
+
+logger = MyLogger("json_store")
+
+
+def load_json(path: str, default: Any = None) -> Any:
+    """
+    Load JSON from a file.
+
+    Args:
+        path: File path to read
+        default: Value returned if the file is missing or unreadable
+
+    Returns:
+        The parsed JSON, or default
+    """
+    if not os.path.exists(path):
+        return default
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load '{path}': {type(e).__name__}: {e}")
+        return default
+
+
+def save_json(path: str, data: Any) -> bool:
+    """
+    Atomically write JSON to a file (write to a temp file, then rename over the target).
+
+    Args:
+        path: File path to write
+        data: JSON-serializable data
+
+    Returns:
+        bool: True if the file was written, False otherwise
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Failed to save '{path}': {type(e).__name__}: {e}")
+        return False
@@ -0,0 +1,65 @@
+"""Compact code-block table rendering of active matches (the ladder-bot "table" render mode)"""
+from typing import List, Tuple
+
+from src.util.embed import is_observer, is_observer_team
+
+MatchRow = Tuple[str, str, str]  # (ladder, map, players)
+
+
+def _format_player_cell(player: dict) -> str:
+    """Plain-text counterpart of embed._format_player_string: no emoji or links, which don't align in a code block."""
+    cell = f"{player['playerName']} ({player['playerFaction']})"
+    if player.get('twitchProfile') and player.get('twitchLiveAtStart', False):
+        cell += " [live]"
+    return cell
+
+
+def create_match_rows(ladder_abbrev: str, match_data: list) -> List[MatchRow]:
+    """Build one table row per active match, leaving observers out."""
+    rows = []
+    for match in match_data:
+        if match['ladderType'] == "2vs2":
+            teams = {}
+            for player in match['players']:
+                if not is_observer_team(player.get('teamId')):
+                    teams.setdefault(player.get('teamId'), []).append(_format_player_cell(player))
+            players_text = " vs ".join(", ".join(team) for team in teams.values())
+        else:
+            players_text = " vs ".join(
+                _format_player_cell(player) for player in match['players'] if not is_observer(player)
+            )
+
+        rows.append((ladder_abbrev.upper(), match['mapName'], players_text))
+    return rows
+
+
+def format_match_table(rows: List[MatchRow], max_chars: int) -> str:
+    """
+    Render rows as an aligned code block no longer than max_chars.
+    Rows that don't fit are summarised in a trailing "... and N more" line.
+    """
+    if not rows:
+        return ""
+
+    ladder_width = max(len(ladder) for ladder, _, _ in rows)
+    map_width = max(len(map_name) for _, map_name, _ in rows)
+    lines = [
+        f"{ladder:<{ladder_width}}  {map_name:<{map_width}}  {players}"
+        for ladder, map_name, players in rows
+    ]
+
+    fence_chars = len("```\n") + len("\n```")
+    kept: List[str] = []
+    used = fence_chars
+    for index, line in enumerate(lines):
+        remaining = len(lines) - index
+        more_line = f"... and {remaining} more"
+        # Always leave room for the "... and N more" line in case a later row doesn't fit
+        reserve = 0 if remaining == 1 else len(more_line) + 1
+        if used + len(line) + 1 + reserve > max_chars:
+            kept.append(more_line)
+            break
+        kept.append(line)
+        used += len(line) + 1
+
+    return "```\n" + "\n".join(kept) + "\n```"
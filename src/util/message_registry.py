@@ -0,0 +1,77 @@
+"""Persistent registry of the bot's board messages per channel"""
+from typing import Dict, List
+
+from src.util.json_store import load_json, save_json
+from src.util.logger import MyLogger
+
+logger = MyLogger("message_registry")
+
+
+class MessageRegistry:
+    """
+    Maps channel ID -> ordered list of message IDs (one per board page) and mirrors
+    every change to a JSON file, so a restarted bot can keep editing the same
+    messages instead of posting new ones.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the registry.
+
+        Args:
+            path: JSON file the registry is persisted to
+        """
+        self.path = path
+        self._message_ids: Dict[int, List[int]] = {}
+
+    def load(self) -> None:
+        """Load the registry from disk, replacing the in-memory entries"""
+        data = load_json(self.path, default={})
+        try:
+            self._message_ids = {
+                # Older registries stored a single message ID per channel
+                int(channel_id): [int(message_id)] if isinstance(message_id, int) else [int(m) for m in message_id]
+                for channel_id, message_id in data.items()
+            }
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.error(f"Ignoring malformed message registry '{self.path}': {e}")
+            self._message_ids = {}
+        logger.log(f"Loaded board messages for {len(self._message_ids)} channel(s) from '{self.path}'")
+
+    def save(self) -> None:
+        """Write the registry to disk"""
+        save_json(self.path, {str(channel_id): message_ids for channel_id, message_ids in self._message_ids.items()})
+
+    def get(self, channel_id: int) -> List[int]:
+        """Return the channel's page message IDs in display order (empty if none)"""
+        return list(self._message_ids.get(channel_id, []))
+
+    def pop(self, channel_id: int) -> List[int]:
+        if channel_id not in self._message_ids:
+            return []
+        message_ids = self._message_ids.pop(channel_id)
+        self.save()
+        return message_ids
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._message_ids
+
+    def __getitem__(self, channel_id: int) -> List[int]:
+        return list(self._message_ids[channel_id])
+
+    def __setitem__(self, channel_id: int, message_ids: List[int]) -> None:
+        message_ids = list(message_ids)
+        if self._message_ids.get(channel_id) == message_ids:
+            return
+        if message_ids:
+            self._message_ids[channel_id] = message_ids
+        else:
+            self._message_ids.pop(channel_id, None)
+        self.save()
+
+    def __delitem__(self, channel_id: int) -> None:
+        del self._message_ids[channel_id]
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self._message_ids)
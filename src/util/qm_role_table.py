@@ -0,0 +1,113 @@
+"""QM ranking role names and per-guild rank -> role lookup tables, compiled from configuration"""
+from typing import Dict, List, Optional, Set
+
+import discord
+
+from src.constants.constants import DISCORDS, QM_ROLE_TIERS
+from src.util.guild_index import normalize_name
+from src.util.logger import MyLogger
+
+logger = MyLogger("qm_role_table")
+
+MAX_RANKED = QM_ROLE_TIERS[-1][0]  # Players ranked below the last tier get no role
+
+# _TIER_BY_RANK[rank] -> role name suffix, for every rank from 1 to MAX_RANKED
+_TIER_BY_RANK: List[Optional[str]] = [None] * (MAX_RANKED + 1)
+_lowest = 1
+for _last_rank, _suffix in QM_ROLE_TIERS:
+    for _rank in range(_lowest, _last_rank + 1):
+        _TIER_BY_RANK[_rank] = _suffix
+    _lowest = _last_rank + 1
+
+
+def get_role_name(ladder, rank) -> Optional[str]:
+    """Role name for a ladder rank, e.g. ("YR", 4) -> "YR QM Top 5", or None if the rank has no role"""
+    if not 1 <= rank <= MAX_RANKED:
+        return None
+    return f"{ladder} {_TIER_BY_RANK[rank]}"
+
+
+def qm_role_names(ladder) -> List[str]:
+    """Every tier's role name for a ladder, best tier first"""
+    return [f"{ladder} {suffix}" for _, suffix in QM_ROLE_TIERS]
+
+
+class QMRoleTable:
+    """
+    Rank -> role lookup for one guild's configured ladders.
+
+    Role names per rank are computed once from the tiers. Role IDs are resolved
+    against the guild's roles on bind() and cached, so a lookup is a list index
+    plus guild.get_role(); the guild's roles are only rescanned when a cached
+    role has disappeared or a role was missing last time.
+    """
+
+    def __init__(self, guild_id: int, ladders: List[str]):
+        """
+        Build the table.
+
+        Args:
+            guild_id: Guild the table belongs to
+            ladders: Ladder abbreviations as they appear in /rankings (e.g. "YR")
+        """
+        self.guild_id = guild_id
+        self.ladders = list(ladders)
+        self.max_rank = MAX_RANKED
+        self._role_names: Dict[str, List[Optional[str]]] = {
+            ladder: [get_role_name(ladder, rank) for rank in range(MAX_RANKED + 1)] for ladder in self.ladders
+        }
+        self._role_ids: Dict[str, int] = {}  # role name -> role ID
+        self._guild: Optional[discord.Guild] = None
+
+    def role_names(self) -> List[str]:
+        """All role names this table manages"""
+        return [name for ladder in self.ladders for name in qm_role_names(ladder)]
+
+    def bind(self, guild: discord.Guild) -> List[str]:
+        """
+        Resolve the table's role names to the guild's roles.
+
+        Returns:
+            Role names that don't exist in the guild
+        """
+        cached_roles_valid = self._guild is guild and all(guild.get_role(role_id) for role_id in self._role_ids.values())
+        if not cached_roles_valid or len(self._role_ids) < len(self.role_names()):
+            roles_by_name: Dict[str, discord.Role] = {}
+            for role in sorted(guild.roles, key=lambda r: r.position, reverse=True):
+                roles_by_name[normalize_name(role.name)] = role  # Lowest position wins on duplicate names
+            self._role_ids = {
+                name: roles_by_name[normalize_name(name)].id
+                for name in self.role_names() if normalize_name(name) in roles_by_name
+            }
+            self._guild = guild
+        return [name for name in self.role_names() if name not in self._role_ids]
+
+    def role_for(self, ladder: str, rank: int) -> Optional[discord.Role]:
+        """Return the bound guild's role for a ladder rank, or None if there is none"""
+        if self._guild is None or ladder not in self._role_names or not 1 <= rank <= self.max_rank:
+            return None
+        role_id = self._role_ids.get(self._role_names[ladder][rank])
+        return self._guild.get_role(role_id) if role_id is not None else None
+
+    def role_name_for(self, ladder: str, rank: int) -> Optional[str]:
+        if ladder not in self._role_names or not 1 <= rank <= self.max_rank:
+            return None
+        return self._role_names[ladder][rank]
+
+    def managed_role_ids(self) -> Set[int]:
+        """IDs of the bound guild's roles this table manages"""
+        return set(self._role_ids.values())
+
+
+def compile_role_tables(discords: Dict[int, dict]) -> Dict[int, QMRoleTable]:
+    """Build a QMRoleTable for every guild that lists "qm_role_ladders" in its config"""
+    tables = {
+        guild_id: QMRoleTable(guild_id, info["qm_role_ladders"])
+        for guild_id, info in discords.items() if info.get("qm_role_ladders")
+    }
+    logger.debug(f"Compiled QM role tables for {len(tables)} guild(s)")
+    return tables
+
+
+# Compiled once at import, i.e. at startup
+QM_ROLE_TABLES: Dict[int, QMRoleTable] = compile_role_tables(DISCORDS)
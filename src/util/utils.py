@@ -1,16 +1,29 @@
 from discord.ext.commands import Bot
-from requests import RequestException
 from io import StringIO
 import discord
 
 from src.constants.constants import CNCNET_LADDER_DEV_DISCORD_BOT_LOGS_ID
+from src.svc.circuit_breaker import CircuitOpenError
+from src.svc.rate_limiter import RateLimitedError
 from src.util.logger import MyLogger
 
 logger = MyLogger("utils")
 
 
 def is_error(obj):
-    return isinstance(obj, Exception) or isinstance(obj, RequestException)
+    return isinstance(obj, Exception)
+
+
+def is_api_unavailable(obj):
+    """True if the API call was refused without being made (open circuit or rate limit)"""
+    return isinstance(obj, (CircuitOpenError, RateLimitedError))
+
+
+def api_unavailable_msg(e):
+    retry_after = max(round(e.retry_after), 1)
+    if isinstance(e, RateLimitedError):
+        return f"Too many ladder lookups right now, please try again in {retry_after}s."
+    return f"The ladder API is unavailable right now, please try again in {retry_after}s."
 
 
 # Send error message to channel on discord for bot logs